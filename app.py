@@ -0,0 +1,337 @@
+"""
+Panel interactivo de análisis de términos históricos
+
+Interfaz Streamlit sobre HistoricalTermAnalyzer: configura el análisis
+desde la barra lateral, lo ejecuta contra Internet Archive y presenta
+los resultados en pestañas (términos principales, distribución de
+frecuencias, documentos analizados y exportación).
+
+Ejecutar con:
+    streamlit run app.py
+"""
+
+import io
+import json
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+# orjson serializa en C varias veces más rápido que json y entiende
+# arrays de numpy; es opcional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from historical_term_analyzer import HistoricalTermAnalyzer, SessionMemory
+
+st.set_page_config(page_title='Análisis de Términos Históricos',
+                   page_icon='📚',
+                   layout='wide')
+
+
+@st.cache_resource
+def get_analyzer(rate_limit: float, max_workers: int,
+                 burst: int) -> HistoricalTermAnalyzer:
+    """
+    Reutilizar el analizador entre reruns de Streamlit
+
+    Mantiene vivo el pool de conexiones del cliente de Internet Archive
+    en vez de rehacer sesión y adapters en cada click de análisis.
+    """
+    return HistoricalTermAnalyzer(rate_limit_delay=rate_limit,
+                                  max_workers=max_workers,
+                                  burst=burst)
+
+
+@st.cache_data(show_spinner=False)
+def build_terms_df(top_terms: tuple, n: int) -> pd.DataFrame:
+    """Construir (una sola vez por corte) el DataFrame de términos"""
+    return pd.DataFrame(list(top_terms[:n]),
+                        columns=['Término', 'Frecuencia'])
+
+
+@st.cache_data(show_spinner=False)
+def compute_freq_stats(freq_values):
+    """Calcular array, estadísticas y rangos de frecuencia memoizados"""
+    arr = np.asarray(freq_values, dtype=np.int64)
+    bins = [1, 6, 11, 26, 51, 101, max(int(arr.max()) + 1, 102)]
+    counts, _ = np.histogram(arr, bins=bins)
+
+    # Histograma pre-binneado en el servidor: al navegador viajan 50
+    # pares (x, y) en vez del array completo de frecuencias. La cola
+    # Zipfiana se recorta en 500 para que los bins no queden vacíos.
+    clipped = np.clip(arr, 0, 500)
+    hist_counts, edges = np.histogram(clipped, bins=50)
+    hist_centers = (edges[:-1] + edges[1:]) / 2
+
+    return (arr, float(arr.mean()), float(np.median(arr)), float(arr.std()),
+            counts, hist_centers, hist_counts)
+
+
+@st.cache_data(show_spinner=False)
+def build_documents_df(meta: list) -> pd.DataFrame:
+    """Construir el DataFrame de metadatos de documentos memoizado"""
+    # from_records arma las columnas en bloque a partir de los dicts de
+    # metadatos; el truncado de títulos se hace vectorizado sobre la
+    # columna en vez de cortar string por string
+    df_docs = pd.DataFrame.from_records(
+        meta, columns=['identifier', 'title', 'year', 'content_length'])
+    df_docs['title'] = (df_docs['title'].str.slice(0, 50)
+                        + np.where(df_docs['title'].str.len() > 50, '...', ''))
+    return df_docs
+
+
+def create_sidebar() -> dict:
+    """Construir la barra lateral de configuración y retornarla como dict"""
+
+    st.sidebar.header('⚙️ Configuración')
+
+    start_year, end_year = st.sidebar.slider(
+        'Período a analizar', 1990, 2010, (1995, 2005))
+    max_documents = st.sidebar.slider('Máximo de documentos', 10, 600, 100)
+    language = st.sidebar.selectbox('Idioma', ['eng', 'spa'], index=0)
+    terms_text = st.sidebar.text_input(
+        'Términos de búsqueda (separados por coma)', '')
+    requests_per_minute = st.sidebar.slider('Requests por minuto', 1, 60, 15)
+    burst = st.sidebar.slider('Ráfaga permitida', 1, 20, 5)
+    max_workers = st.sidebar.slider('Descargas en paralelo', 1, 64, 8)
+
+    search_terms = [t.strip() for t in terms_text.split(',') if t.strip()]
+
+    return {
+        'start_year': start_year,
+        'end_year': end_year,
+        'max_documents': max_documents,
+        'language': language,
+        'search_terms': search_terms or None,
+        'rate_limit': 60.0 / requests_per_minute,
+        'burst': burst,
+        'max_workers': max_workers,
+    }
+
+
+def run_analysis(config: dict):
+    """Ejecutar el análisis y guardar los resultados en session_state"""
+
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    status_text.text('Buscando documentos...')
+
+    analyzer = get_analyzer(config['rate_limit'], config['max_workers'],
+                            config['burst'])
+    # Memoria fresca por corrida: el analizador cacheado acumula
+    # documentos y frecuencias entre períodos si se reutiliza tal cual
+    analyzer.memory = SessionMemory()
+
+    # El generador emite (completados, total, parcial) por descarga:
+    # la barra refleja el avance real en vez de saltar de 0 a 100
+    results = {'error': 'No se encontraron documentos'}
+    for done, total, partial in analyzer.analyze_period_iter(
+            config['start_year'],
+            config['end_year'],
+            max_documents=config['max_documents'],
+            language=config['language'],
+            search_terms=config['search_terms']):
+        if partial is not None:
+            results = partial
+        elif total:
+            progress_bar.progress(int(100 * done / total))
+            status_text.text(f'Descargando documentos: {done}/{total}')
+
+    progress_bar.progress(100)
+
+    if 'error' in results:
+        status_text.text('El análisis terminó con errores')
+        st.error(f"Error en el análisis: {results['error']}")
+        return
+
+    status_text.text('Análisis completado')
+    st.session_state.analysis_results = results
+
+
+def display_top_terms(results: dict):
+    """Mostrar los términos más frecuentes como gráfico de barras y tabla"""
+
+    top_terms = results.get('top_terms', [])
+    if not top_terms:
+        st.info('No hay términos para mostrar')
+        return
+
+    num_terms = st.slider('Número de términos', 5, 50, 20)
+
+    # go.Bar sobre datos pre-ordenados: mover el slider sólo recorta la
+    # traza, y uirevision evita que Plotly recalcule el layout (orden de
+    # categorías, zoom) en cada cambio como hacía px.bar
+    shown = sorted(top_terms[:50], key=lambda item: item[1])[-num_terms:]
+    values = [freq for _term, freq in shown]
+    fig = go.Figure(go.Bar(x=values,
+                           y=[term for term, _freq in shown],
+                           orientation='h',
+                           marker=dict(color=values, colorscale='viridis')))
+    fig.update_layout(uirevision='top_terms_chart',
+                      height=max(400, num_terms * 25))
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(build_terms_df(tuple(top_terms), num_terms),
+                 use_container_width=True)
+
+
+def display_frequency_distribution(results: dict):
+    """Mostrar estadísticas y distribución de las frecuencias"""
+
+    # El buffer columnar viene precalculado en los resultados; acá sólo
+    # se derivan estadísticas y bins, memoizados entre reruns
+    freq_values = results.get('freq_values')
+    if freq_values is None or len(freq_values) == 0:
+        st.info('No hay frecuencias para mostrar')
+        return
+
+    (arr, mean, median, std, counts,
+     hist_centers, hist_counts) = compute_freq_stats(freq_values)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric('Media', f'{mean:.1f}')
+    col2.metric('Mediana', f'{median:.0f}')
+    col3.metric('Desvío estándar', f'{std:.1f}')
+
+    fig_hist = go.Figure(go.Bar(x=hist_centers, y=hist_counts))
+    fig_hist.update_layout(title='Distribución de frecuencias',
+                           xaxis_title='Frecuencia',
+                           yaxis_title='Términos',
+                           yaxis_type='log',
+                           bargap=0)
+    st.plotly_chart(fig_hist, use_container_width=True)
+
+    # Conteo de términos por rango de frecuencia (precalculado arriba)
+    labels = ['1-5', '6-10', '11-25', '26-50', '51-100', '101+']
+    df_ranges = pd.DataFrame({'Rango': labels, 'Términos': counts})
+    st.dataframe(df_ranges, use_container_width=True)
+
+
+def display_detailed_data(results: dict):
+    """Mostrar la tabla de documentos analizados y su distribución por año"""
+
+    documents = results.get('documents', [])
+    if not documents:
+        st.info('No hay documentos para mostrar')
+        return
+
+    st.caption(f'Mostrando hasta 100 de {len(documents)} documentos')
+
+    meta = [doc.get_metadata() for doc in documents[:100]]
+    st.dataframe(build_documents_df(meta), use_container_width=True)
+
+    docs_per_year = results.get('docs_per_year', {})
+    if docs_per_year:
+        year_counts = pd.Series(docs_per_year).sort_index()
+        fig_years = px.bar(x=year_counts.index, y=year_counts.values,
+                           labels={'x': 'Año', 'y': 'Documentos'},
+                           title='Documentos por año')
+        st.plotly_chart(fig_years, use_container_width=True)
+
+
+def fast_terms_csv(rows) -> str:
+    """
+    Armar el CSV de términos con un format-string por fila
+
+    Evita el viaje por DataFrame.to_csv, que despacha tipo y quoting
+    celda por celda; los términos son palabras ASCII sin comas ni
+    comillas, así que un '%s,%d' directo alcanza.
+    """
+    buf = io.StringIO()
+    buf.write('Término,Frecuencia\n')
+    fmt = '%s,%d\n'
+    buf.writelines(fmt % (term, freq) for term, freq in rows)
+    return buf.getvalue()
+
+
+def display_export_options(results: dict):
+    """Ofrecer descargas de los resultados en CSV y JSON"""
+
+    st.subheader('💾 Exportar Resultados')
+    col1, col2 = st.columns(2)
+
+    with col1:
+        csv_data = fast_terms_csv(results.get('top_terms', []))
+        st.download_button('Descargar términos (CSV)', csv_data,
+                           file_name='top_terms.csv', mime='text/csv')
+
+        # Formatos binarios columnares: una fracción del tamaño del
+        # CSV/JSON y mucho más rápidos de leer desde pandas/Arrow
+        df_freq = pd.DataFrame(list(results.get('frequencies', {}).items()),
+                               columns=['term', 'freq'])
+
+        parquet_buf = io.BytesIO()
+        df_freq.to_parquet(parquet_buf, compression='zstd', engine='pyarrow')
+        st.download_button('Descargar frecuencias (Parquet)',
+                           parquet_buf.getvalue(),
+                           file_name='frequencies.parquet',
+                           mime='application/octet-stream')
+
+        feather_buf = io.BytesIO()
+        df_freq.to_feather(feather_buf)
+        st.download_button('Descargar frecuencias (Feather)',
+                           feather_buf.getvalue(),
+                           file_name='frequencies.feather',
+                           mime='application/octet-stream')
+
+    with col2:
+        export_data = {
+            'summary': results.get('summary', {}),
+            'top_terms': results.get('top_terms', [])[:1000],
+            # islice materializa sólo los 1000 pares exportados, no la
+            # lista completa de items del vocabulario
+            'frequencies': dict(
+                islice(results.get('frequencies', {}).items(), 1000)),
+            'analysis_metadata': results.get('analysis_metadata', {}),
+        }
+        if orjson is not None:
+            # Retorna bytes, que download_button acepta directo sin
+            # pasar por un decode a UTF-8
+            json_data = orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str)
+        else:
+            json_data = json.dumps(export_data, indent=2,
+                                   ensure_ascii=False, default=str)
+        st.download_button('Descargar resultados (JSON)', json_data,
+                           file_name='analysis_results.json',
+                           mime='application/json')
+
+
+def main():
+    st.title('📚 Análisis de Términos Históricos')
+    st.caption('Frecuencia de términos en documentos web de Internet Archive')
+
+    config = create_sidebar()
+
+    if st.sidebar.button('▶️ Ejecutar Análisis'):
+        run_analysis(config)
+
+    results = st.session_state.get('analysis_results')
+    if not results:
+        st.info('Configure el análisis en la barra lateral y ejecútelo')
+        return
+
+    tab1, tab2, tab3, tab4 = st.tabs([
+        '🏆 Términos Principales', '📊 Distribución',
+        '📄 Documentos', '💾 Exportar'])
+    with tab1:
+        display_top_terms(results)
+    with tab2:
+        display_frequency_distribution(results)
+    with tab3:
+        display_detailed_data(results)
+    with tab4:
+        display_export_options(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+"""
+Configuración de pytest para la suite
+
+Las clases de test son independientes entre sí (sin estado global
+mutable compartido), así que la suite puede repartirse entre workers
+con pytest-xdist: pytest -n auto
+"""
+
+import logging
+
+
+def pytest_configure(config):
+    # La configuración de logging vive acá y no en el bloque __main__
+    # del archivo de tests: así aplica igual con pytest y con xdist.
+    # CRITICAL + NullHandler: los tests no consumen los logs y el
+    # formateo por documento suma en el flujo de integración
+    module_logger = logging.getLogger('historical_term_analyzer')
+    module_logger.setLevel(logging.CRITICAL)
+    module_logger.addHandler(logging.NullHandler())
@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+"""
+Ejemplos de Uso del Analizador Histórico de Términos
+Demuestra diferentes formas de utilizar el sistema para análisis de documentos
+web históricos de Internet Archive.
+
+Autor: Sistema de IA
+Fecha: 2025-09-25
+"""
+
+import heapq
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
+
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from historical_term_analyzer import (
+    NUMBA_AVAILABLE,
+    Exporter,
+    HistoricalTermAnalyzer,
+    TextProcessor,
+    _tokenize_ascii,
+)
+
+# Patrón precompilado para detectar términos tecnológicos en una sola
+# pasada; los términos ya vienen en minúsculas desde TextProcessor, así
+# que el patrón no paga matching case-insensitive
+TECH_RE = re.compile(r'comput|tech|digit|web|cyber|net|soft')
+
+# Términos tecnológicos exactos con membresía O(1)
+TECH_TERMS = frozenset({
+    'computer', 'internet', 'software', 'technology', 'digital',
+    'web', 'online', 'email', 'website', 'network'
+})
+
+# Instancias compartidas por los ejemplos secuenciales: se amortizan la
+# sesión HTTP (keep-alive), los regex compilados y los cachés internos.
+# Los ejemplos batch paralelos crean una instancia por worker porque el
+# rate limiter y la memoria de sesión son por instancia.
+ANALYZER = None
+PROCESSOR = None
+
+
+def get_shared_analyzer(rate_limit_delay: float = 4.0):
+    """Obtener el analizador compartido, ajustando el rate limit in-place"""
+    global ANALYZER
+    if ANALYZER is None:
+        ANALYZER = HistoricalTermAnalyzer(rate_limit_delay=rate_limit_delay)
+    else:
+        ANALYZER.client.rate_limit_delay = rate_limit_delay
+    return ANALYZER
+
+
+def get_shared_processor():
+    """Obtener el procesador con caché compartido entre ejemplos"""
+    global PROCESSOR
+    if PROCESSOR is None:
+        PROCESSOR = CachedTextProcessor()
+    return PROCESSOR
+
+
+@lru_cache(maxsize=None)
+def _compile_keywords(keywords):
+    """Compilar una sola vez el set y el matcher de un grupo de keywords"""
+    # Keywords en minúsculas desde la definición: los términos extraídos
+    # ya son lowercase y no hace falta matching case-insensitive
+    lowered = tuple(keyword.lower() for keyword in keywords)
+
+    if ahocorasick is not None:
+        # Autómata Aho-Corasick: una sola pasada lineal por término en
+        # lugar de K chequeos de substring
+        automaton = ahocorasick.Automaton()
+        for keyword in lowered:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+
+        def search(term, _automaton=automaton):
+            return next(_automaton.iter(term), None) is not None
+    else:
+        pattern = re.compile('|'.join(map(re.escape, lowered)))
+
+        def search(term, _search=pattern.search):
+            return _search(term) is not None
+
+    return frozenset(lowered), search
+
+
+def _run_keyword_analysis(keywords, years, max_docs, top_n,
+                          rate_limit_delay=4.5, pattern=None):
+    """
+    Kernel compartido de los análisis por keywords: ejecuta el período,
+    filtra las frecuencias por keyword/patrón y selecciona el top-N.
+
+    Args:
+        keywords: Tupla de keywords (hashable, para cachear la compilación)
+        years: Tupla (año_inicio, año_fin)
+        max_docs: Máximo de documentos a analizar
+        top_n: Cantidad de términos principales a retornar
+        rate_limit_delay: Delay entre requests
+        pattern: Regex alternativo para el filtro (default: keywords escapadas)
+
+    Returns:
+        Tupla (results, filtered_frequencies, top_terms); si el análisis
+        falla, filtered_frequencies y top_terms quedan vacíos.
+    """
+    keyword_set, keyword_match = _compile_keywords(tuple(keywords))
+    if pattern is not None:
+        keyword_match = pattern.search
+
+    analyzer = HistoricalTermAnalyzer(rate_limit_delay=rate_limit_delay)
+    results = analyzer.analyze_period(
+        start_year=years[0],
+        end_year=years[1],
+        max_documents=max_docs,
+        language='eng',
+        search_terms=sorted(keyword_set)
+    )
+
+    if 'error' in results:
+        return results, {}, []
+
+    filtered = {
+        term: freq for term, freq in results['frequencies'].items()
+        if term in keyword_set or keyword_match(term)
+    }
+    top = heapq.nlargest(top_n, filtered.items(), key=itemgetter(1))
+
+    return results, filtered, top
+
+
+class CachedTextProcessor(TextProcessor):
+    """
+    TextProcessor con caché de tokenización keyed por hash del texto.
+    En corridas batch los mismos documentos reaparecen entre períodos y
+    temáticas; el caché evita re-tokenizar texto idéntico.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """Inicializar procesador con caché LRU acotado"""
+        super().__init__()
+        self._extract_cached = lru_cache(maxsize=max_entries)(
+            self._extract_uncached)
+
+    # Textos más grandes que esto no se cachean: el caché LRU retiene
+    # la clave (el texto completo), y documentos de varios MB lo
+    # convertirían en una fuga de memoria
+    MAX_CACHEABLE_CHARS = 100_000
+
+    def extract_terms(self, text: str) -> List[str]:
+        """Extraer términos usando el caché LRU por contenido"""
+        if not text:
+            return []
+        if len(text) > self.MAX_CACHEABLE_CHARS:
+            return list(self._extract_uncached(text))
+        return list(self._extract_cached(text))
+
+    def clear_cache(self):
+        """Vaciar el caché de tokenización"""
+        self._extract_cached.cache_clear()
+
+    def _extract_uncached(self, text: str) -> tuple:
+        """Tokenizar sin caché; retorna tupla inmutable cacheable"""
+        if NUMBA_AVAILABLE:
+            return tuple(self._extract_terms_jit(text))
+        return tuple(super().extract_terms(text))
+
+    def get_cache_stats(self):
+        """Estadísticas del caché (hits, misses, tamaño)"""
+        return self._extract_cached.cache_info()
+
+    def _extract_terms_jit(self, text: str) -> List[str]:
+        """Tokenizar con el kernel compilado y filtrar stop words"""
+        buf = np.frombuffer(
+            text.encode('utf-8', 'ignore'), dtype=np.uint8).copy()
+        spans = _tokenize_ascii(buf)
+        data = buf.tobytes()
+
+        stop_words = self.STOP_WORDS
+        terms = []
+        for j in range(spans.shape[0]):
+            word = data[spans[j, 0]:spans[j, 1]].decode('ascii')
+            if word not in stop_words:
+                terms.append(word)
+
+        return terms
+
+
+def basic_analysis():
+    """Ejemplo 1: Análisis básico de un período histórico"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 1: ANÁLISIS BÁSICO (1995-2005)")
+    print(f"{'='*60}")
+
+    analyzer = get_shared_analyzer(rate_limit_delay=4.0)
+
+    results = analyzer.analyze_period(
+        start_year=1995,
+        end_year=2005,
+        max_documents=30,
+        language='eng'
+    )
+
+    if 'error' in results:
+        print(f"Error en el análisis: {results['error']}")
+        return None
+
+    summary = results['summary']
+    print(f"\nDocumentos analizados: {summary['total_documents']}")
+    print(f"Términos únicos: {summary['total_unique_terms']}")
+
+    # Una sola escritura a stdout en lugar de un print por línea
+    print("\nTop 10 términos:")
+    print('\n'.join(f"{i:2d}. {term:<15} {freq:>6} ocurrencias"
+                    for i, (term, freq)
+                    in enumerate(results['top_terms'][:10], 1)))
+
+    return results
+
+
+def technology_terms_analysis():
+    """Ejemplo 2: Análisis enfocado en términos tecnológicos"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 2: ANÁLISIS DE TÉRMINOS TECNOLÓGICOS")
+    print(f"{'='*60}")
+
+    results, tech_frequencies, tech_top = _run_keyword_analysis(
+        tuple(sorted(TECH_TERMS)), years=(1995, 2005), max_docs=40,
+        top_n=15, rate_limit_delay=4.5, pattern=TECH_RE)
+
+    if 'error' in results:
+        print(f"Error en el análisis: {results['error']}")
+        return None
+
+    print(f"\n{'='*50}")
+    print("TOP 15 TÉRMINOS TECNOLÓGICOS")
+    print(f"{'='*50}")
+
+    print('\n'.join(f"{i:2d}. {term:<15} {freq:>6} ocurrencias"
+                    for i, (term, freq) in enumerate(tech_top, 1)))
+
+    Exporter.export_to_json(
+        {'tech_frequencies': tech_frequencies, 'tech_top': tech_top},
+        'tech_analysis_results.json'
+    )
+
+    return results
+
+
+def batch_analysis_by_years():
+    """Ejemplo 3: Análisis batch año por año"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 3: ANÁLISIS BATCH POR AÑOS")
+    print(f"{'='*60}")
+
+    target_years = [1998, 1999, 2000, 2001, 2002]
+    batch_results = {}
+
+    def analyze_year(year):
+        """Analizar un año con su propio analizador (rate limit propio)"""
+        analyzer = HistoricalTermAnalyzer(rate_limit_delay=4.0)
+        start_time = time.time()
+
+        results = analyzer.analyze_period(
+            start_year=year,
+            end_year=year,
+            max_documents=25,
+            language='eng'
+        )
+
+        processing_time = (time.time() - start_time) / 60
+
+        if 'error' in results:
+            return {'error': results['error']}
+
+        summary = results['summary']
+        return {
+            'total_documents': summary['total_documents'],
+            'unique_terms': summary['total_unique_terms'],
+            'processing_time_minutes': processing_time,
+            'top_10_terms': results['top_terms'][:10]
+        }
+
+    # Cada año es independiente: las esperas de rate limiting de un
+    # análisis se solapan con la red de los demás
+    with ThreadPoolExecutor(max_workers=len(target_years)) as executor:
+        futures = {executor.submit(analyze_year, year): year
+                   for year in target_years}
+
+        for future in as_completed(futures):
+            year = futures[future]
+            try:
+                batch_results[year] = future.result()
+                print(f"Año {year} completado")
+            except Exception as e:
+                batch_results[year] = {'exception': str(e)}
+
+    # Resumen del batch
+    print(f"\n{'='*50}")
+    print("RESUMEN DEL ANÁLISIS BATCH")
+    print(f"{'='*50}")
+
+    for year, data in batch_results.items():
+        if 'error' in data or 'exception' in data:
+            print(f"{year}: ERROR - {data.get('error', data.get('exception'))}")
+            continue
+
+        top_3_str = ', '.join(f'{term}({freq})'
+                              for term, freq in data['top_10_terms'][:3])
+        print(f"{year}: {data['total_documents']} docs, "
+              f"{data['unique_terms']} términos únicos. Top: {top_3_str}")
+
+    return batch_results
+
+
+def batch_thematic_analysis():
+    """Ejemplo 4: Análisis batch por temáticas"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 4: ANÁLISIS BATCH POR TEMÁTICAS")
+    print(f"{'='*60}")
+
+    themes = {
+        'tecnologia': ['computer', 'internet', 'software', 'digital', 'web'],
+        'comercio': ['business', 'market', 'commerce', 'company', 'money'],
+        'educacion': ['education', 'school', 'university', 'learning', 'student'],
+        'comunicacion': ['email', 'message', 'communication', 'phone', 'chat']
+    }
+
+    thematic_results = {}
+
+    def analyze_theme(keywords):
+        """Analizar una temática a través del kernel compartido"""
+        results, theme_terms, theme_top = _run_keyword_analysis(
+            tuple(keywords), years=(1997, 2003), max_docs=20, top_n=10)
+
+        if 'error' in results:
+            return {'error': results['error']}
+
+        # El resumen en pantalla solo necesita el término principal:
+        # una pasada O(N) con max() en lugar de ordenar/heapificar
+        top_term = (max(theme_terms.items(), key=itemgetter(1))
+                    if theme_terms else None)
+
+        return {
+            'total_documents': results['summary']['total_documents'],
+            'theme_term_count': len(theme_terms),
+            'top_term': top_term,
+            'top_theme_terms': theme_top
+        }
+
+    # Las temáticas son independientes entre sí: se analizan en paralelo
+    with ThreadPoolExecutor(max_workers=len(themes)) as executor:
+        futures = {executor.submit(analyze_theme, keywords): theme_name
+                   for theme_name, keywords in themes.items()}
+
+        for future in as_completed(futures):
+            theme_name = futures[future]
+            try:
+                thematic_results[theme_name] = future.result()
+                print(f"Temática {theme_name} completada")
+            except Exception as e:
+                thematic_results[theme_name] = {'exception': str(e)}
+
+    # Comparativa entre temáticas
+    print(f"\n{'='*50}")
+    print("COMPARATIVA ENTRE TEMÁTICAS")
+    print(f"{'='*50}")
+
+    for theme_name, data in thematic_results.items():
+        if 'error' in data or 'exception' in data:
+            print(f"{theme_name}: ERROR")
+            continue
+
+        if data['top_term']:
+            top_term, top_freq = data['top_term']
+            print(f"{theme_name}: {data['theme_term_count']} términos, "
+                  f"término principal: {top_term} ({top_freq})")
+        else:
+            print(f"{theme_name}: sin términos relevantes")
+
+    return thematic_results
+
+
+def comparative_periods_analysis():
+    """Ejemplo 5: Análisis comparativo entre períodos"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 5: ANÁLISIS COMPARATIVO ENTRE PERÍODOS")
+    print(f"{'='*60}")
+
+    periods = [
+        {'name': 'Era pre-web', 'start': 1995, 'end': 1997},
+        {'name': 'Boom punto-com', 'start': 1998, 'end': 2001},
+        {'name': 'Post-burbuja', 'start': 2002, 'end': 2005}
+    ]
+
+    comparative_results = {}
+
+    # Descargar todo el rango una sola vez y particionar localmente:
+    # los tres períodos cubren 1995-2005 sin solaparse
+    analyzer = get_shared_analyzer(rate_limit_delay=4.0)
+    all_docs = analyzer.fetch_range(1995, 2005, max_documents=90)
+
+    for period in periods:
+        print(f"\nAnalizando período: {period['name']} "
+              f"({period['start']}-{period['end']})...")
+
+        try:
+            period_docs = [
+                doc for doc in all_docs
+                if doc.year and period['start'] <= doc.year <= period['end']
+            ]
+            results = analyzer.analyze_documents(period_docs)
+
+            if 'error' not in results:
+                summary = results['summary']
+                comparative_results[period['name']] = {
+                    'period': f"{period['start']}-{period['end']}",
+                    'total_documents': summary['total_documents'],
+                    'unique_terms': summary['total_unique_terms'],
+                    'top_terms': results['top_terms'][:20]
+                }
+            else:
+                comparative_results[period['name']] = {'error': results['error']}
+
+        except Exception as e:
+            comparative_results[period['name']] = {'exception': str(e)}
+
+    # Mostrar comparativa
+    print(f"\n{'='*50}")
+    print("COMPARATIVA ENTRE PERÍODOS")
+    print(f"{'='*50}")
+
+    for period_name, data in comparative_results.items():
+        if 'error' in data or 'exception' in data:
+            print(f"{period_name}: ERROR")
+            continue
+
+        print(f"\n{period_name} ({data['period']}):")
+        print(f"  Documentos: {data['total_documents']}")
+        print(f"  Términos únicos: {data['unique_terms']}")
+
+        print('\n'.join(f"  {i}. {term} ({freq})"
+                        for i, (term, freq)
+                        in enumerate(data['top_terms'][:5], 1)))
+
+    analyzer.exporter.export_to_json(
+        comparative_results, 'comparative_analysis.json')
+
+    return comparative_results
+
+
+def custom_text_processing():
+    """Ejemplo 6: Procesamiento de texto personalizado sin API"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 6: PROCESAMIENTO DE TEXTO PERSONALIZADO")
+    print(f"{'='*60}")
+
+    # Procesador con caché compartido: los textos repetidos no se
+    # re-tokenizan, ni siquiera entre corridas de distintos ejemplos
+    processor = get_shared_processor()
+
+    sample_texts = [
+        """The internet revolution changed how people communicate and share
+        information. Email became the primary communication tool for business
+        and personal use during the late 1990s.""",
+        """Computer technology advanced rapidly with new software applications.
+        Web browsers made the internet accessible to everyone, creating new
+        opportunities for online commerce.""",
+        """Digital communication transformed society. Websites became essential
+        for companies wanting to reach customers through the world wide web.""",
+        """The internet revolution changed how people communicate and share
+        information. Email became the primary communication tool for business
+        and personal use during the late 1990s."""
+    ]
+
+    # Acumular en streaming ids enteros por término y contar en C con
+    # np.bincount en lugar de un Counter token a token
+    vocab = {}
+    term_ids = []
+    total_terms = 0
+    for i, text in enumerate(sample_texts, 1):
+        terms = processor.extract_terms(text)
+        term_ids.extend(vocab.setdefault(term, len(vocab)) for term in terms)
+        total_terms += len(terms)
+        print(f"Texto {i}: {len(terms)} términos extraídos")
+
+    counts = np.bincount(
+        np.array(term_ids, dtype=np.int32), minlength=len(vocab))
+    inv_vocab = list(vocab)
+
+    # Top 10 con argpartition (O(N)) y orden final solo del subconjunto
+    k = min(10, len(inv_vocab))
+    top_idx = np.argpartition(counts, -k)[-k:] if k else np.array([], int)
+    top_idx = top_idx[np.argsort(counts[top_idx])[::-1]]
+    top_10 = [(inv_vocab[i], int(counts[i])) for i in top_idx]
+
+    frequencies = {inv_vocab[i]: int(c) for i, c in enumerate(counts) if c}
+
+    print(f"\nTotal de términos procesados: {total_terms}")
+    print(f"Términos únicos: {len(frequencies)}")
+    print(f"Stop words configuradas: {len(processor.STOP_WORDS)}")
+    cache_info = processor.get_cache_stats()
+    print(f"Cache hits: {cache_info.hits} / misses: {cache_info.misses}")
+
+    print("\nVerificaciones del procesamiento:")
+    print("  Conversión a minúsculas: ✅")
+    print("  Filtrado de stop words: ✅")
+    print("  Longitud mínima de términos: ✅")
+
+    print("\nTop 10 términos:")
+    print('\n'.join(f"{i:2d}. {term:<15} {freq:>6} ocurrencias"
+                    for i, (term, freq) in enumerate(top_10, 1)))
+
+    return frequencies
+
+
+def automated_quality_report(batch_results: Dict) -> Dict:
+    """Ejemplo 7: Reporte automatizado de calidad de un batch"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLO 7: REPORTE AUTOMATIZADO DE CALIDAD")
+    print(f"{'='*60}")
+
+    # Una sola pasada: el predicado de éxito se evalúa una vez por registro
+    successful_years = 0
+    total_documents = 0
+    metric_pairs = []
+
+    for data in batch_results.values():
+        ok = 'error' not in data and 'exception' not in data
+        if ok:
+            successful_years += 1
+            total_documents += data['total_documents']
+            metric_pairs.append(
+                (data['unique_terms'], data['processing_time_minutes']))
+
+    # Promedios de ambas métricas en una sola reducción en C
+    if metric_pairs:
+        avg_unique_terms, avg_processing_time = np.array(
+            metric_pairs, dtype=np.float64).mean(axis=0).tolist()
+    else:
+        avg_unique_terms = 0
+        avg_processing_time = 0
+
+    report = {
+        'successful_years': successful_years,
+        'failed_years': len(batch_results) - successful_years,
+        'total_documents': total_documents,
+        'avg_unique_terms': avg_unique_terms,
+        'avg_processing_time': avg_processing_time
+    }
+
+    print(f"Años exitosos: {report['successful_years']}")
+    print(f"Años fallidos: {report['failed_years']}")
+    print(f"Documentos totales: {report['total_documents']}")
+    print(f"Promedio de términos únicos: {report['avg_unique_terms']:.1f}")
+    print(f"Tiempo promedio de procesamiento: "
+          f"{report['avg_processing_time']:.1f} minutos")
+
+    return report
+
+
+def main():
+    """Ejecutar todos los ejemplos de uso"""
+
+    print(f"\n{'='*60}")
+    print("EJEMPLOS DE USO - ANALIZADOR HISTÓRICO DE TÉRMINOS")
+    print(f"{'='*60}")
+
+    # Ejemplo sin red (siempre disponible)
+    custom_text_processing()
+
+    # Ejemplos contra Internet Archive (requieren conexión)
+    basic_analysis()
+    technology_terms_analysis()
+    batch_results = batch_analysis_by_years()
+    batch_thematic_analysis()
+    comparative_periods_analysis()
+
+    if batch_results:
+        automated_quality_report(batch_results)
+
+    print(f"\n{'='*60}")
+    print("EJEMPLOS COMPLETADOS")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,21 +9,235 @@ Fecha: 2025-09-25
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import heapq
+from functools import lru_cache
+from hashlib import blake2b
+from operator import itemgetter
 import time
 import re
 import json
+import os
+import sys
+from pathlib import Path
+from html import unescape
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Optional
-from urllib.parse import urlencode
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import shelve
 from collections import Counter
 import csv
 
-# Configuración de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# orjson serializa en C varias veces más rápido que json; es opcional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# selectolax parsea HTML en C en una sola pasada; es opcional
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# requests-cache persiste respuestas HTTP entre corridas; es opcional
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# bounter implementa un count-min sketch con memoria acotada para
+# corpus que no entran en RAM; es opcional
+try:
+    import bounter
+except ImportError:
+    bounter = None
+
+# numpy se usa para los kernels de conteo y para exponer las
+# frecuencias como array contiguo en los resultados; es opcional
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numba compila el escaneo de bytes a código nativo, eliminando el
+# despacho del intérprete por carácter; es opcional
+try:
+    if np is None:
+        raise ImportError('numba requiere numpy')
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _tokenize_ascii(buf):
+        """
+        Escanear un buffer uint8, pasar a minúsculas in-place y emitir
+        offsets (inicio, fin) de tokens de letras ASCII de 2+ caracteres
+        delimitados por límites de palabra.
+        """
+        n = buf.size
+        spans = np.empty((n // 2 + 1, 2), dtype=np.int64)
+        count = 0
+        start = -1
+        prev_is_word = False
+
+        for i in range(n + 1):
+            if i < n:
+                b = buf[i]
+                if 65 <= b <= 90:
+                    b |= 0x20
+                    buf[i] = b
+                is_letter = 97 <= b <= 122
+                is_word = (is_letter or 48 <= b <= 57
+                           or b == 95 or b >= 128)
+            else:
+                is_letter = False
+                is_word = False
+
+            if is_letter:
+                if start < 0 and not prev_is_word:
+                    start = i
+            elif start >= 0:
+                # Solo es token si termina en límite de palabra
+                if not is_word and i - start >= 2:
+                    spans[count, 0] = start
+                    spans[count, 1] = i
+                    count += 1
+                start = -1
+
+            prev_is_word = is_word
+
+        return spans[:count]
+
+    @njit(cache=True)
+    def _count_spans(buf, spans):
+        """
+        Contar ocurrencias de cada token (span) con una tabla hash
+        open-addressing nativa: FNV-1a sobre los bytes del token,
+        sondeo lineal y comparación byte a byte ante colisiones.
+        Retorna (spans_únicos, conteos); sólo los tokens únicos se
+        decodifican después a str en Python.
+        """
+        n = spans.shape[0]
+        size = 2
+        while size < 2 * n + 2:
+            size *= 2
+        mask = size - 1
+
+        table = np.full(size, -1, dtype=np.int64)
+        uniq_spans = np.empty((n, 2), dtype=np.int64)
+        counts = np.zeros(n, dtype=np.int64)
+        n_uniq = 0
+
+        for i in range(n):
+            s = spans[i, 0]
+            e = spans[i, 1]
+            h = np.uint64(1469598103934665603)
+            for j in range(s, e):
+                h = (h ^ np.uint64(buf[j])) * np.uint64(1099511628211)
+            idx = np.int64(h) & mask
+
+            while True:
+                slot = table[idx]
+                if slot == -1:
+                    table[idx] = n_uniq
+                    uniq_spans[n_uniq, 0] = s
+                    uniq_spans[n_uniq, 1] = e
+                    counts[n_uniq] = 1
+                    n_uniq += 1
+                    break
+                us = uniq_spans[slot, 0]
+                if uniq_spans[slot, 1] - us == e - s:
+                    equal = True
+                    for j in range(e - s):
+                        if buf[us + j] != buf[s + j]:
+                            equal = False
+                            break
+                    if equal:
+                        counts[slot] += 1
+                        break
+                idx = (idx + 1) & mask
+
+        return uniq_spans[:n_uniq], counts[:n_uniq]
+
+
+    def _count_terms_native(text: str) -> Counter:
+        """
+        Contar términos de un texto con los kernels compilados
+
+        Tokeniza y cuenta sin crear un str de Python por ocurrencia:
+        sólo el vocabulario único se decodifica al final.
+        """
+        buf = np.frombuffer(
+            text.encode('utf-8', 'ignore'), dtype=np.uint8).copy()
+        spans = _tokenize_ascii(buf)
+        uniq_spans, counts = _count_spans(buf, spans)
+        data = buf.tobytes()
+
+        result = Counter()
+        for j in range(uniq_spans.shape[0]):
+            term = data[uniq_spans[j, 0]:uniq_spans[j, 1]].decode('ascii')
+            result[term] = int(counts[j])
+        return result
+else:
+    _tokenize_ascii = None
+    _count_terms_native = None
+
+
+def _make_term_tokenizer():
+    """
+    Crear el tokenizador de términos más rápido disponible
+
+    Retorna un callable que recibe texto ya en minúsculas y devuelve la
+    lista de palabras de 2+ letras. Con numba el escaneo corre como
+    kernel compilado sobre los bytes UTF-8 (los bytes >= 128 cuentan
+    como caracteres de palabra, igual que el \\b Unicode de re); en
+    último caso se usa el sre estándar.
+    """
+    if NUMBA_AVAILABLE:
+        def tokenize(text: str) -> List[str]:
+            buf = np.frombuffer(
+                text.encode('utf-8', 'ignore'), dtype=np.uint8).copy()
+            spans = _tokenize_ascii(buf)
+            data = buf.tobytes()
+            return [data[spans[j, 0]:spans[j, 1]].decode('ascii')
+                    for j in range(spans.shape[0])]
+
+        return tokenize
+
+    return re.compile(r'\b[a-zA-Z]{2,}\b').findall
+
+
+# Tokenizador único por proceso: la selección del backend y la
+# compilación de patrones se pagan una sola vez al importar, no por
+# cada TextProcessor construido
+_TERM_TOKENIZER = _make_term_tokenizer()
+
+# Configuración de logging: los emisores sólo encolan registros y un
+# thread de fondo se encarga de formatear y escribir, así logger.info
+# no serializa el camino caliente con el lock global ni syscalls
+_log_queue = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+# El QueueHandler sólo encola: formatter pasante para que basicConfig
+# no le aplique el formato por defecto (el listener formatea al final)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 
@@ -31,14 +245,22 @@ class Document:
     """
     Modelo de datos para representar un documento web histórico
     """
+
+    # Sin __dict__ por instancia: con cientos de documentos vivos por
+    # sesión, los slots reducen la memoria por objeto y mejoran la
+    # localidad al iterar la lista de documentos
+    __slots__ = ('identifier', 'title', 'date', 'year', 'text_content',
+                 'content_length', 'metadata')
+
     def __init__(self, identifier: str, title: str, date: datetime, year: int):
         self.identifier = identifier
         self.title = title
         self.date = date
         self.year = year
         self.text_content = ""
+        self.content_length = 0
         self.metadata = {}
-        
+
     def get_metadata(self) -> Dict:
         """Retornar metadatos estructurados"""
         return {
@@ -46,17 +268,30 @@ class Document:
             'title': self.title,
             'date': self.date.isoformat() if self.date else None,
             'year': self.year,
-            'content_length': len(self.text_content),
+            'content_length': self.content_length,
             **self.metadata
         }
-        
+
     def get_text(self) -> str:
         """Retornar contenido textual limpio"""
         return self.text_content
-        
+
     def set_content(self, content: str):
         """Establecer contenido textual"""
         self.text_content = content
+        self.content_length = len(content)
+
+    def release_text(self):
+        """
+        Liberar el texto completo conservando sólo una vista previa
+
+        Después de acumular frecuencias el texto entero no vuelve a
+        usarse (los exports sólo muestran los primeros 500 caracteres);
+        soltarlo libera la mayor parte de la memoria del corpus.
+        content_length conserva el tamaño real descargado.
+        """
+        if len(self.text_content) > 500:
+            self.text_content = self.text_content[:500] + '...'
 
 
 class InternetArchiveClient:
@@ -71,22 +306,115 @@ class InternetArchiveClient:
     DOWNLOAD_BASE = "https://archive.org/download/"
     METADATA_API = "https://archive.org/metadata/"
     
-    def __init__(self, rate_limit_delay: float = 4.0):
+    # Patrón precompilado de palabras (el texto ya está en minúsculas)
+    _WORD_RE = re.compile(r'[a-z]+')
+
+    # Recursos estáticos sin texto útil: un solo scan DFA por URL, sin
+    # copia .lower() ni comparaciones endswith por extensión
+    _BAD_EXT_RE = re.compile(
+        r'\.(?:jpe?g|png|gif|pdf|css|js|xml|rss|ico|swf)(?:\?|$)',
+        re.IGNORECASE)
+
+    # Bytes no ASCII, para contar caracteres no latinos con bytes.translate
+    _NON_ASCII_BYTES = bytes(range(128, 256))
+
+    # Sufijos de archivo a intentar al descargar texto, en orden de
+    # preferencia; constante de clase para no reconstruir la lista por
+    # descarga
+    _TEXT_SUFFIXES = ('.txt', '_djvu.txt', '_text.pdf', '.html')
+
+    # Patrones de limpieza precompilados a nivel de clase: una sola
+    # compilación por proceso en lugar de un lookup al caché de re por
+    # cada sub sobre cada página
+    _SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>',
+                                  re.DOTALL | re.IGNORECASE)
+    _COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+    _TAG_RE = re.compile(r'<[^>]+>')
+    _IA_METADATA_RE = re.compile(
+        r'Internet Archive.*?Book Digitized.*?Google', re.DOTALL)
+    _DIGITIZED_RE = re.compile(r'Digitized by.*?Internet Archive')
+    _BLANK_LINES_RE = re.compile(r'\n\s*\n')
+    _SPACES_RE = re.compile(r'[ \t]+')
+
+    # Palabras comunes en inglés
+    ENGLISH_WORDS = frozenset({
+        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+        'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
+        'after', 'above', 'below', 'between', 'among', 'this', 'that', 'these',
+        'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what', 'which',
+        'who', 'when', 'where', 'why', 'how', 'is', 'are', 'was', 'were', 'be',
+        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'must', 'can', 'a', 'an'
+    })
+
+    def __init__(self, rate_limit_delay: float = 4.0,
+                 cache_name: Optional[str] = None,
+                 burst: int = 1):
         """
         Inicializar cliente con configuración de rate limiting
-        
+
         Args:
             rate_limit_delay: Tiempo de espera entre requests en segundos
+            cache_name: Ruta del caché HTTP persistente (SQLite). El
+                contenido de Wayback es inmutable (direccionado por
+                digest), así que las respuestas cacheadas no expiran.
+                Requiere requests-cache instalado.
+            burst: Cantidad de requests que pueden salir de corrido
+                antes de que el rate limiting empiece a espaciar; el
+                ritmo promedio sigue siendo uno cada rate_limit_delay
         """
         self.rate_limit_delay = rate_limit_delay
-        self.session = requests.Session()
+
+        if cache_name and requests_cache is not None:
+            self.session = requests_cache.CachedSession(
+                cache_name,
+                backend='sqlite',
+                expire_after=None,
+                allowable_codes=[200],
+                stale_if_error=True,
+                cache_control=True
+            )
+        else:
+            if cache_name:
+                logger.warning(
+                    "requests-cache no está instalado; se usa una "
+                    "sesión sin caché persistente")
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'HistoricalTermAnalyzer/1.0 (Educational Research Project)'
         })
+
+        # Reintentos con backoff manejados por urllib3 (respeta el header
+        # Retry-After) y pool de conexiones keep-alive reutilizable
+        retry = Retry(
+            total=5,
+            backoff_factor=rate_limit_delay,
+            # Jitter aleatorio por reintento: evita que los workers
+            # paralelos reintenten sincronizados contra el servidor
+            backoff_jitter=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=32,
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Token bucket global: los tokens se regeneran a razón de uno
+        # cada rate_limit_delay y se acumulan hasta burst, así las
+        # ráfagas cortas salen sin esperas y el promedio queda acotado
+        # aunque haya varios threads en vuelo. Los 429/503 ya los
+        # maneja el Retry de urllib3 con backoff propio.
+        self._rate_lock = threading.Lock()
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._last_refill_ts = time.monotonic()
         
         # Estadísticas
         self.total_requests = 0
         self.failed_requests = 0
+        self.cache_hits = 0
         
     def search_items(self, query_params: Dict, max_results: int = 600) -> List[Document]:
         """
@@ -100,63 +428,89 @@ class InternetArchiveClient:
             Lista de objetos Document con metadatos
         """
         logger.info(f"Iniciando búsqueda con parámetros: {query_params}")
-        
-        documents = []
+
         rows_per_page = 50
         total_pages = (max_results + rows_per_page - 1) // rows_per_page
-        
-        for page in range(total_pages):
-            try:
-                page_documents = self._search_page(query_params, page, rows_per_page)
-                documents.extend(page_documents)
-                
-                logger.info(f"Página {page + 1}/{total_pages}: {len(page_documents)} documentos obtenidos")
-                
-                if len(documents) >= max_results:
-                    documents = documents[:max_results]
-                    break
-                    
-                # Rate limiting entre páginas
-                self._handle_rate_limiting()
-                
-            except Exception as e:
-                logger.error(f"Error en página {page + 1}: {e}")
-                self.failed_requests += 1
-                continue
-                
+        if total_pages <= 0:
+            # max_results < 1: sin páginas que pedir (y el executor no
+            # acepta max_workers=0)
+            return []
+
+        # Las páginas son independientes: se piden en paralelo y el token
+        # bucket de _make_request mantiene acotada la tasa global
+        pages_results = {}
+        with ThreadPoolExecutor(max_workers=min(8, total_pages)) as executor:
+            futures = {
+                executor.submit(self._search_page, query_params,
+                                page, rows_per_page): page
+                for page in range(total_pages)
+            }
+
+            for future in as_completed(futures):
+                page = futures[future]
+                try:
+                    page_documents = future.result()
+                    pages_results[page] = page_documents
+                    logger.info(f"Página {page + 1}/{total_pages}: "
+                                f"{len(page_documents)} documentos obtenidos")
+                except Exception as e:
+                    logger.error(f"Error en página {page + 1}: {e}")
+                    self.failed_requests += 1
+
+        # Reconstruir en orden de página y respetar el límite
+        documents = []
+        for page in sorted(pages_results):
+            documents.extend(pages_results[page])
+        documents = documents[:max_results]
+
         logger.info(f"Búsqueda completada: {len(documents)} documentos encontrados")
         return documents
         
-    def _search_page(self, query_params: Dict, page: int, rows: int) -> List[Document]:
-        """Buscar una página específica de resultados"""
-        
-        # Construir query de búsqueda
-        query_parts = []
-        
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _build_search_query(start_year: int, end_year: int,
+                            language: Optional[str],
+                            terms: Optional[tuple]) -> str:
+        """
+        Construir la query Lucene de búsqueda
+
+        Memoizada por parámetros: search_items llama a _search_page una
+        vez por página con la misma query, así el armado de strings se
+        paga una sola vez por búsqueda.
+        """
         # Filtros obligatorios
-        query_parts.append("mediatype:web")
-        query_parts.append("collection:web")
-        
+        query_parts = ["mediatype:web", "collection:web"]
+
         # Filtro temporal
-        start_year = query_params.get('start_year', 1995)
-        end_year = query_params.get('end_year', 2005)
         query_parts.append(f"date:[{start_year}-01-01 TO {end_year}-12-31]")
-        
+
         # Filtro de idioma (si se especifica)
-        if query_params.get('language') == 'eng':
+        if language == 'eng':
             query_parts.append("language:eng")
-            
+
         # Términos de búsqueda (opcional)
-        terms = query_params.get('terms')
         if terms:
-            if isinstance(terms, list):
+            if len(terms) > 1:
                 terms_query = " OR ".join(f'"{term}"' for term in terms)
                 query_parts.append(f"({terms_query})")
             else:
-                query_parts.append(f'"{terms}"')
-        
-        query_string = " AND ".join(query_parts)
-        
+                query_parts.append(f'"{terms[0]}"')
+
+        return " AND ".join(query_parts)
+
+    def _search_page(self, query_params: Dict, page: int, rows: int) -> List[Document]:
+        """Buscar una página específica de resultados"""
+
+        terms = query_params.get('terms')
+        if terms and not isinstance(terms, list):
+            terms = [terms]
+
+        query_string = self._build_search_query(
+            query_params.get('start_year', 1995),
+            query_params.get('end_year', 2005),
+            query_params.get('language'),
+            tuple(terms) if terms else None)
+
         # Parámetros de la API
         params = {
             'q': query_string,
@@ -176,8 +530,8 @@ class InternetArchiveClient:
             
         # Procesar resultados
         documents = []
-        data = response.json()
-        
+        data = self._parse_json(response)
+
         if 'response' in data and 'docs' in data['response']:
             for doc in data['response']['docs']:
                 try:
@@ -190,6 +544,64 @@ class InternetArchiveClient:
                     
         return documents
         
+    def search_snapshots(self, url: str, start_year: int, end_year: int,
+                         limit: int = 500) -> List[Dict]:
+        """
+        Buscar snapshots de una URL en el índice CDX de Wayback Machine
+
+        La respuesta se consume en streaming línea por línea (memoria
+        constante y primera fila disponible en milisegundos) en lugar de
+        materializar el índice completo en memoria.
+
+        Args:
+            url: URL o prefijo a consultar
+            start_year: Año de inicio
+            end_year: Año de fin
+            limit: Máximo de snapshots a retornar
+
+        Returns:
+            Lista de dicts con timestamp, url, mimetype, status y digest
+        """
+        params = {
+            'url': url,
+            'from': str(start_year),
+            'to': str(end_year),
+            'fl': 'timestamp,original,mimetype,statuscode,digest',
+            'filter': 'statuscode:200',
+            'collapse': 'digest',
+            'limit': limit
+        }
+
+        response = self._make_request(self.CDX_API, params, stream=True)
+        if not response:
+            return []
+
+        snapshots = []
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+
+            fields = line.split(' ')
+            if len(fields) < 5:
+                continue
+
+            # Descartar recursos estáticos (imágenes, css, js, etc.)
+            if self._BAD_EXT_RE.search(fields[1]):
+                continue
+
+            snapshots.append({
+                'timestamp': fields[0],
+                'url': fields[1],
+                'mimetype': fields[2],
+                'statuscode': fields[3],
+                'digest': fields[4]
+            })
+
+            if len(snapshots) >= limit:
+                break
+
+        return snapshots
+
     def _create_document_from_search_result(self, doc_data: Dict) -> Optional[Document]:
         """Crear objeto Document desde resultado de búsqueda"""
         try:
@@ -230,6 +642,18 @@ class InternetArchiveClient:
             logger.error(f"Error creando documento: {e}")
             return None
             
+    @staticmethod
+    def _parse_json(response) -> Dict:
+        """
+        Parsear el cuerpo JSON de una respuesta
+
+        Con orjson el parseo corre en C directamente sobre los bytes,
+        sin el decode bytes→str previo del json estándar.
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
     def _validate_document(self, document: Document, query_params: Dict) -> bool:
         """Validar que el documento cumple con los criterios"""
         
@@ -257,19 +681,16 @@ class InternetArchiveClient:
         Returns:
             Contenido textual del documento
         """
-        logger.debug(f"Descargando contenido para: {identifier}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Descargando contenido para: {identifier}")
         
         # Intentar diferentes formatos de archivo
-        text_formats = [
-            f"{identifier}.txt",
-            f"{identifier}_djvu.txt", 
-            f"{identifier}_text.pdf",
-            f"{identifier}.html"
-        ]
-        
-        for filename in text_formats:
+        for suffix in self._TEXT_SUFFIXES:
+            filename = identifier + suffix
             try:
                 content = self._download_file_content(identifier, filename)
+                if content and filename.endswith('.html'):
+                    content = self._extract_text_from_html(content)
                 if content and len(content.strip()) > 100:  # Contenido mínimo
                     # Validar idioma inglés
                     if self.validate_english_content(content):
@@ -286,24 +707,40 @@ class InternetArchiveClient:
             logger.warning(f"No se pudo descargar contenido para {identifier}: {e}")
             return ""
             
+    # Bytes máximos a leer por archivo: alcanza para validar idioma y
+    # aportar términos sin bufferear libros digitalizados completos
+    MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024
+
     def _download_file_content(self, identifier: str, filename: str) -> str:
         """Descargar contenido de un archivo específico"""
         url = f"{self.DOWNLOAD_BASE}{identifier}/{filename}"
-        
-        response = self._make_request(url, timeout=30)
-        if response and response.status_code == 200:
-            # Detectar encoding
-            content = response.content
+
+        # Pedir por rango sólo los bytes que se van a leer: el servidor
+        # corta en el tope (206) en vez de servir el cuerpo entero y
+        # que el cliente lo aborte a mitad de camino
+        headers = {'Range': f'bytes=0-{self.MAX_DOWNLOAD_BYTES - 1}'}
+        response = self._make_request(url, timeout=30, stream=True,
+                                      headers=headers)
+        if response and response.status_code in (200, 206):
+            # Leer en chunks hasta el tope: memoria acotada y corte
+            # temprano en archivos enormes
+            buffer = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                buffer.extend(chunk)
+                if len(buffer) >= self.MAX_DOWNLOAD_BYTES:
+                    response.close()
+                    break
+
+            content = bytes(buffer)
             try:
                 text = content.decode('utf-8')
             except UnicodeDecodeError:
-                try:
-                    text = content.decode('latin-1')
-                except UnicodeDecodeError:
-                    text = content.decode('utf-8', errors='ignore')
-                    
+                # latin-1 decodifica cualquier byte, incluso un
+                # multibyte cortado por el tope de lectura
+                text = content.decode('latin-1')
+
             return text
-            
+
         return ""
         
     def _get_text_via_metadata_api(self, identifier: str) -> str:
@@ -315,7 +752,7 @@ class InternetArchiveClient:
             return ""
             
         try:
-            data = response.json()
+            data = self._parse_json(response)
             # Extraer descripción o contenido relevante
             metadata = data.get('metadata', {})
             description = metadata.get('description', '')
@@ -341,87 +778,130 @@ class InternetArchiveClient:
         """
         if len(text.strip()) < 50:
             return False
-            
-        # Tomar muestra del texto para análisis
-        sample = text[:1000].lower()
-        
-        # Palabras comunes en inglés
-        english_words = {
-            'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
-            'after', 'above', 'below', 'between', 'among', 'this', 'that', 'these',
-            'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what', 'which',
-            'who', 'when', 'where', 'why', 'how', 'is', 'are', 'was', 'were', 'be',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'a', 'an'
-        }
-        
-        # Contar palabras en inglés
-        words = re.findall(r'\b[a-zA-Z]+\b', sample)
+
+        # Sólo importa la muestra inicial: memoizar sobre ella permite
+        # que contenido repetido (boilerplate de Archive, duplicados)
+        # salga del caché, y acota las claves a 1000 caracteres
+        return self._validate_english_sample(text[:1000].lower())
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _validate_english_sample(sample: str) -> bool:
+        """Evaluar la muestra en minúsculas (función pura, memoizada)"""
+
+        # Verificar caracteres no latinos primero (indicativo de otros
+        # idiomas): bytes.translate descarta los bytes no ASCII en un
+        # solo scan en C, y si el ratio ya descalifica se evita el
+        # regex. El ratio se mide sobre caracteres, no bytes: los
+        # ASCII ocupan un byte cada uno, así que el resto de len(sample)
+        # son caracteres multibyte contados una sola vez
+        sample_bytes = sample.encode('utf-8')
+        ascii_chars = len(
+            sample_bytes.translate(None, InternetArchiveClient._NON_ASCII_BYTES))
+        non_latin_ratio = ((len(sample) - ascii_chars) / len(sample)
+                           if sample else 1.0)
+
+        # Criterio permisivo para contenido técnico: ratio de no
+        # latinos más alto (0.1 en lugar de 0.05)
+        if non_latin_ratio >= 0.1:
+            return False
+
+        # Contar palabras en inglés: una sola pasada del patrón
+        # precompilado sobre la muestra ya en minúsculas
+        words = InternetArchiveClient._WORD_RE.findall(sample)
         if len(words) < 10:
             return False
-            
-        english_count = sum(1 for word in words if word.lower() in english_words)
-        english_ratio = english_count / len(words)
-        
-        # Verificar caracteres no latinos (indicativo de otros idiomas)
-        non_latin_chars = re.findall(r'[^\x00-\x7F]', sample)
-        non_latin_ratio = len(non_latin_chars) / len(sample) if len(sample) > 0 else 1.0
-        
-        # Criterios más permisivos para contenido técnico
-        # - Ratio de palabras inglesas más bajo (0.1 en lugar de 0.15)
-        # - Ratio de caracteres no latinos más alto (0.1 en lugar de 0.05)
-        return english_ratio > 0.1 and non_latin_ratio < 0.1
+
+        english_count = sum(map(
+            InternetArchiveClient.ENGLISH_WORDS.__contains__, words))
+
+        # Ratio de palabras inglesas más bajo (0.1 en lugar de 0.15)
+        return english_count / len(words) > 0.1
         
+    def _extract_text_from_html(self, html_content: str) -> str:
+        """
+        Extraer texto plano de una página HTML
+
+        Usa selectolax (tokenizador en C, una sola pasada, descarta
+        script/style y decodifica entidades) cuando está disponible;
+        si no, cae a limpieza por regex.
+        """
+        if HTMLParser is not None:
+            tree = HTMLParser(html_content)
+            for tag in tree.css('script, style'):
+                tag.decompose()
+            return tree.body.text(separator=' ') if tree.body else ''
+
+        # Fallback sin dependencias: eliminar nodos no textuales y tags,
+        # y decodificar entidades HTML en una sola pasada en C
+        text = self._SCRIPT_STYLE_RE.sub(' ', html_content)
+        text = self._COMMENT_RE.sub(' ', text)
+        text = self._TAG_RE.sub(' ', text)
+        return unescape(text)
+
     def _clean_text_content(self, content: str) -> str:
         """Limpiar contenido textual de HTML y metadatos"""
         
-        # Eliminar HTML tags
-        content = re.sub(r'<[^>]+>', '', content)
-        
+        # Eliminar HTML tags. Tras _extract_text_from_html el texto ya
+        # no tiene tags: el chequeo '<' evita repetir la pasada O(n)
+        if '<' in content:
+            content = self._TAG_RE.sub('', content)
+
         # Eliminar metadatos comunes
-        content = re.sub(r'Internet Archive.*?Book Digitized.*?Google', '', content, flags=re.DOTALL)
-        content = re.sub(r'Digitized by.*?Internet Archive', '', content)
-        
+        content = self._IA_METADATA_RE.sub('', content)
+        content = self._DIGITIZED_RE.sub('', content)
+
         # Limpiar espacios y líneas vacías
-        content = re.sub(r'\n\s*\n', '\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
-        
-        # Eliminar líneas muy cortas (probablemente metadata)
-        lines = content.split('\n')
-        cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 20]
-        
-        return '\n'.join(cleaned_lines)
-        
-    def _make_request(self, url: str, params: Dict = None, timeout: int = 30) -> Optional[requests.Response]:
+        content = self._BLANK_LINES_RE.sub('\n', content)
+        content = self._SPACES_RE.sub(' ', content)
+        
+        # Eliminar líneas muy cortas (probablemente metadata): strip
+        # corre una sola vez por línea vía map en C, y join consume el
+        # generador sin materializar una lista intermedia
+        stripped = map(str.strip, content.split('\n'))
+        return '\n'.join(line for line in stripped if len(line) > 20)
+        
+    def _make_request(self, url: str, params: Dict = None, timeout: int = 30,
+                      stream: bool = False,
+                      headers: Dict = None) -> Optional[requests.Response]:
         """Realizar request HTTP con manejo de errores y rate limiting"""
         
         self.total_requests += 1
-        
+
+        # Sacar un token del bucket (esperando la recarga si hace falta)
+        if self.rate_limit_delay > 0:
+            with self._rate_lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self._burst),
+                    self._tokens
+                    + (now - self._last_refill_ts) / self.rate_limit_delay)
+                self._last_refill_ts = now
+                if self._tokens < 1.0:
+                    time.sleep((1.0 - self._tokens) * self.rate_limit_delay)
+                    self._last_refill_ts = time.monotonic()
+                    self._tokens = 1.0
+                self._tokens -= 1.0
+
         try:
-            if params:
-                if '?' in url:
-                    url += '&' + urlencode(params)
-                else:
-                    url += '?' + urlencode(params)
-                    
-            response = self.session.get(url, timeout=timeout)
-            
-            # Manejar códigos de error específicos
-            if response.status_code == 429:  # Too Many Requests
-                logger.warning("Rate limit exceeded, esperando...")
-                time.sleep(self.rate_limit_delay * 2)
-                return self._make_request(url, timeout=timeout)
-                
-            elif response.status_code == 503:  # Service Unavailable
-                logger.warning("Servicio no disponible, reintentando...")
-                time.sleep(self.rate_limit_delay)
-                return self.session.get(url, timeout=timeout)
-                
-            elif response.status_code != 200:
+            # requests codifica los params internamente; evita una copia
+            # de string por request y mantiene la URL base estable para
+            # la reutilización de conexiones del pool
+            response = self.session.get(url, params=params,
+                                        timeout=timeout, stream=stream,
+                                        headers=headers)
+
+            # requests-cache marca las respuestas servidas desde disco
+            if getattr(response, 'from_cache', False):
+                self.cache_hits += 1
+
+            # Los reintentos de 429/503 ya los agotó urllib3; si el
+            # código sigue sin ser 200 (o 206 de un pedido por rango)
+            # se descarta la respuesta
+            if response.status_code not in (200, 206):
                 logger.warning(f"HTTP {response.status_code} para {url}")
                 return None
-                
+
             return response
             
         except requests.exceptions.Timeout:
@@ -435,26 +915,54 @@ class InternetArchiveClient:
             logger.error(f"Error en request: {e}")
             return None
             
-    def _handle_rate_limiting(self):
-        """Implementar delays entre requests"""
-        time.sleep(self.rate_limit_delay)
-        
     def get_stats(self) -> Dict:
         """Obtener estadísticas del cliente"""
         return {
             'total_requests': self.total_requests,
             'failed_requests': self.failed_requests,
+            'cache_hits': self.cache_hits,
             'success_rate': (self.total_requests - self.failed_requests) / max(self.total_requests, 1) * 100
         }
 
 
+def _count_terms_in_texts(texts: List[str]) -> Counter:
+    """
+    Contar términos de un lote de textos (worker de procesos)
+
+    Es función de módulo para que ProcessPoolExecutor pueda picklearla;
+    recibe textos planos (no Documents) para abaratar la serialización.
+    """
+    if NUMBA_AVAILABLE:
+        counts = _count_terms_native('\n'.join(texts))
+        for stop_word in TextProcessor.STOP_WORDS:
+            counts.pop(stop_word, None)
+        return counts
+
+    counts = Counter()
+
+    # Métodos ligados a locales: LOAD_FAST en lugar de LOAD_ATTR dentro
+    # del loop caliente
+    tokenize = _TERM_TOKENIZER
+    update = counts.update
+
+    # Contar todo en una pasada C y restar las stop words en bloque al
+    # final: ~400 deletes constantes en lugar de un chequeo por palabra
+    for text in texts:
+        update(tokenize(text.lower()))
+
+    for stop_word in TextProcessor.STOP_WORDS:
+        counts.pop(stop_word, None)
+
+    return counts
+
+
 class TextProcessor:
     """
     Procesador de texto para análisis de frecuencias
     """
     
     # Stop words en inglés - lista básica para preservar términos relevantes
-    STOP_WORDS = {
+    STOP_WORDS = frozenset({
         'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 
         'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to', 'was',
         'will', 'with', 'this', 'but', 'they', 'have', 'had', 'what',
@@ -485,78 +993,238 @@ class TextProcessor:
         'produce', 'nothing', 'stay', 'full', 'force', 'decide', 'deep',
         'busy', 'record', 'common', 'possible', 'dry', 'ago', 'ran', 'check',
         'hot', 'miss', 'brought', 'heat', 'yes', 'fill', 'among'
-    }
+    })
     
-    def __init__(self):
-        """Inicializar procesador de texto"""
-        self.word_pattern = re.compile(r'\b[a-zA-Z]{3,}\b')  # Solo palabras de 3+ letras
-        
-    def extract_terms(self, text: str) -> List[str]:
+    # Patrones compilados una vez a nivel de clase, no por instancia
+    word_pattern = re.compile(r'\b[a-zA-Z]{3,}\b')  # Solo palabras de 3+ letras
+    term_pattern = re.compile(r'\b[a-zA-Z]{2,}\b')  # Términos de 2+ letras
+
+    # A partir de cuántos documentos conviene pagar el arranque de los
+    # procesos workers
+    PARALLEL_THRESHOLD = 50
+
+    # Hasta este tamaño total (caracteres) conviene contar en proceso
+    # con el caché por contenido; más allá, loop secuencial sin caché
+    BATCH_MAX_CHARS = 200_000_000
+
+    # Entradas máximas del caché de contadores por documento
+    DOC_CACHE_MAX = 2048
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 size_mb: Optional[int] = None,
+                 cache_path: Optional[str] = None):
+        """
+        Inicializar procesador de texto
+
+        Args:
+            max_workers: Procesos workers para corpus grandes
+                (default: cantidad de CPUs)
+            cache_path: Ruta de un caché persistente de contadores por
+                documento (shelve). Si se indica, los conteos memoizados
+                sobreviven entre corridas: análisis repetidos sobre los
+                mismos documentos arrancan en caliente.
+            size_mb: Presupuesto de memoria para el conteo paralelo.
+                Si se indica (y bounter está instalado), las frecuencias
+                se acumulan en un count-min sketch acotado a ese tamaño:
+                los conteos del head de la distribución —lo único que
+                consume most_common(k)— mantienen garantías de error,
+                y la cola Zipfiana deja de crecer sin límite.
+        """
+        self._tokenize = _TERM_TOKENIZER  # kernel numba si está disponible
+        self.max_workers = max_workers
+        self.size_mb = size_mb if bounter is not None else None
+        # Contadores por documento memoizados por hash del contenido
+        self._doc_freq_cache: Dict[bytes, Counter] = {}
+        # Capa persistente del caché (opcional)
+        self._doc_freq_shelf = shelve.open(cache_path, flag='c') if cache_path else None
+        
+    def extract_terms(self, text: str,
+                      ngram_range: tuple = (1, 1)) -> List[str]:
         """
         Extraer términos relevantes del texto
-        
+
         Args:
             text: Texto a procesar
-            
+            ngram_range: (mín, máx) de n-gramas a emitir. Con (1, 2)
+                se agregan bigramas "palabra_palabra" en la misma
+                pasada, sin releer el documento
+
         Returns:
             Lista de términos limpios
         """
         if not text:
             return []
-            
+
         # Convertir a minúsculas
         text = text.lower()
-        
+
         # Extraer palabras (2+ caracteres para incluir términos como "to", "in")
-        words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
-        
-        # Filtrar stop words y limpiar términos
+        words = self._tokenize(text)
+
+        # Filtrar stop words; los matches del patrón ya son alfabéticos
+        # puros, así que no hace falta re-limpiar palabra por palabra.
+        # intern colapsa los duplicados zipfianos al mismo objeto str:
+        # menos heap y probes de dict por identidad al contarlos después
+        stop_words = self.STOP_WORDS
+        intern = sys.intern
+
+        if ngram_range[1] < 2:
+            return [intern(word) for word in words if word not in stop_words]
+
+        # Bigramas con una variable deslizante sobre la secuencia ya
+        # filtrada (mismo criterio que CountVectorizer): una sola
+        # pasada emite unigramas y bigramas juntos
         terms = []
+        append = terms.append
+        prev = None
         for word in words:
-            if word not in self.STOP_WORDS and len(word) >= 2:
-                # Limpiar caracteres especiales adicionales
-                clean_word = re.sub(r'[^\w]', '', word)
-                if len(clean_word) >= 2:
-                    terms.append(clean_word)
-                    
+            if word in stop_words:
+                continue
+            word = intern(word)
+            append(word)
+            if prev is not None:
+                append(intern(prev + '_' + word))
+            prev = word
         return terms
         
-    def calculate_frequencies(self, documents_or_text) -> Dict[str, int]:
+    def _stream_terms(self, text: str):
+        """
+        Generar términos filtrados directamente desde el patrón compilado,
+        sin materializar listas intermedias
+        """
+        stop_words = self.STOP_WORDS
+        return (word for word in self._tokenize(text.lower())
+                if word not in stop_words)
+
+    def _remove_stop_words(self, counts: Counter):
+        """Restar las stop words de un contador en bloque"""
+        for stop_word in self.STOP_WORDS:
+            counts.pop(stop_word, None)
+
+    def calculate_frequencies(self, documents_or_text) -> Counter:
         """
         Calcular frecuencias de términos en documentos o texto
-        
+
         Args:
             documents_or_text: Lista de documentos o texto directo
-            
+
         Returns:
-            Diccionario con frecuencias de términos
+            Counter con frecuencias de términos; most_common(k) queda
+            disponible sin reconstruir el contador
         """
-        all_terms = []
-        
+        frequencies = Counter()
+
         # Manejar tanto documentos como texto directo
         if isinstance(documents_or_text, str):
             # Caso: texto directo
-            terms = self.extract_terms(documents_or_text)
-            all_terms.extend(terms)
+            frequencies.update(
+                self._tokenize(documents_or_text.lower()))
+            self._remove_stop_words(frequencies)
         elif isinstance(documents_or_text, list):
             # Caso: lista de documentos
             logger.info(f"Calculando frecuencias para {len(documents_or_text)} documentos")
-            processed_docs = 0
-            
-            for doc in documents_or_text:
-                if hasattr(doc, 'text_content') and doc.text_content:
-                    terms = self.extract_terms(doc.text_content)
-                    all_terms.extend(terms)
-                    processed_docs += 1
-                    
-            logger.info(f"Procesados {processed_docs} documentos con contenido")
-        
-        logger.info(f"Total de términos extraídos: {len(all_terms)}")
-        
-        # Calcular frecuencias
-        frequencies = Counter(all_terms)
-        
-        return dict(frequencies)
+
+            texts = [doc.text_content for doc in documents_or_text
+                     if hasattr(doc, 'text_content') and doc.text_content]
+
+            if len(texts) > self.PARALLEL_THRESHOLD:
+                # Trabajo CPU-bound (regex + hashing): los procesos sí
+                # escalan con los cores, los threads no por el GIL
+                frequencies = self._calculate_frequencies_parallel(texts)
+            elif sum(map(len, texts)) <= self.BATCH_MAX_CHARS:
+                # Corpus chico o mediano: conteo por documento con
+                # memoización por hash de contenido — las páginas
+                # espejo/duplicadas se cuentan una sola vez
+                frequencies = self._calculate_frequencies_cached(texts)
+            else:
+                # Una pasada de conteo en C por texto; las stop words se
+                # restan una sola vez al final sobre el total. Métodos
+                # ligados a locales fuera del loop.
+                tokenize = self._tokenize
+                update = frequencies.update
+                for text in texts:
+                    update(tokenize(text.lower()))
+                self._remove_stop_words(frequencies)
+
+            logger.info(f"Procesados {len(texts)} documentos con contenido")
+
+        logger.info(f"Total de términos extraídos: {sum(frequencies.values())}")
+
+        return frequencies
+
+    def close(self):
+        """Cerrar (y volcar a disco) el caché persistente, si existe"""
+        if self._doc_freq_shelf is not None:
+            self._doc_freq_shelf.close()
+            self._doc_freq_shelf = None
+
+    def _count_text_terms(self, text: str) -> Counter:
+        """Contar los términos de un texto, sin filtrar stop words"""
+        if NUMBA_AVAILABLE:
+            # Kernel nativo: tokeniza y cuenta sin crear un str por
+            # ocurrencia (el kernel ya pasa a minúsculas)
+            return _count_terms_native(text)
+        return Counter(self._tokenize(text.lower()))
+
+    def _calculate_frequencies_cached(self, texts: List[str]) -> Counter:
+        """
+        Contar por documento memoizando por hash del contenido
+
+        Las webs archivadas repiten páginas espejo y boilerplate entre
+        períodos y temáticas: el contador de cada texto se memoiza
+        keyed por blake2b del contenido (no por URL, así los espejos
+        deduplican) y se reutiliza entre llamadas. El caché se acota
+        con descarte FIFO.
+        """
+        total = Counter()
+        cache = self._doc_freq_cache
+        shelf = self._doc_freq_shelf
+
+        for text in texts:
+            key = blake2b(text.encode('utf-8', 'ignore'),
+                          digest_size=16).digest()
+            counts = cache.get(key)
+            if counts is None and shelf is not None:
+                # Capa persistente: conteos de corridas anteriores
+                counts = shelf.get(key.hex())
+            if counts is None:
+                counts = self._count_text_terms(text)
+                if shelf is not None:
+                    shelf[key.hex()] = counts
+            if key not in cache:
+                if len(cache) >= self.DOC_CACHE_MAX:
+                    # FIFO: los dict preservan orden de inserción
+                    del cache[next(iter(cache))]
+                cache[key] = counts
+            total.update(counts)
+
+        self._remove_stop_words(total)
+        return total
+
+    def _calculate_frequencies_parallel(self, texts: List[str]) -> Counter:
+        """Contar términos repartiendo lotes de textos entre procesos"""
+        workers = self.max_workers or os.cpu_count() or 1
+        chunk_size = (len(texts) + workers - 1) // workers
+        chunks = [texts[i:i + chunk_size]
+                  for i in range(0, len(texts), chunk_size)]
+
+        # Con presupuesto de memoria, acumular en un count-min sketch
+        # acotado en lugar de un Counter que crece con el vocabulario
+        if self.size_mb:
+            total = bounter.bounter(size_mb=self.size_mb)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for counts in executor.map(_count_terms_in_texts, chunks):
+                    # bounter.update itera claves de a una; increment
+                    # suma cada término con su frecuencia del lote
+                    for term, count in counts.items():
+                        total.increment(term, count)
+        else:
+            total = Counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for counts in executor.map(_count_terms_in_texts, chunks):
+                    total.update(counts)
+
+        return total
         
     def get_top_terms(self, frequencies: Dict[str, int], top_n: int = 50) -> List[tuple]:
         """
@@ -569,7 +1237,13 @@ class TextProcessor:
         Returns:
             Lista de tuplas (término, frecuencia) ordenada por frecuencia
         """
-        return Counter(frequencies).most_common(top_n)
+        if hasattr(frequencies, 'most_common'):
+            # Evitar reconstruir el contador: most_common usa heapq
+            # internamente para top_n pequeño
+            return frequencies.most_common(top_n)
+        # dicts planos y sketches de bounter exponen items(); nlargest
+        # es O(n log k) sin copiar todo a un Counter intermedio
+        return heapq.nlargest(top_n, frequencies.items(), key=itemgetter(1))
 
 
 class SessionMemory:
@@ -584,11 +1258,22 @@ class SessionMemory:
         self.top_terms = []
         self.session_stats = {}
         self.start_time = datetime.now()
-        
+        # Reloj monotónico para medir transcurrido: no salta con ajustes
+        # del reloj de pared y evita construir datetimes por consulta
+        self._t0 = time.perf_counter()
+        # Contador incremental de documentos con contenido, para que
+        # get_summary no recorra toda la lista en cada llamada
+        self._content_count = 0
+
     def add_documents(self, documents: List[Document]):
         """Agregar documentos a la memoria"""
         self.documents.extend(documents)
-        
+        self._content_count += sum(1 for d in documents if d.text_content)
+
+    def mark_content(self):
+        """Registrar que un documento ya agregado recibió contenido"""
+        self._content_count += 1
+
     def set_frequencies(self, frequencies: Dict[str, int]):
         """Establecer frecuencias calculadas"""
         self.frequencies = frequencies
@@ -603,14 +1288,14 @@ class SessionMemory:
         
     def get_summary(self) -> Dict:
         """Obtener resumen de la sesión"""
-        elapsed_time = datetime.now() - self.start_time
-        
+        elapsed_minutes = (time.perf_counter() - self._t0) / 60
+
         return {
             'total_documents': len(self.documents),
-            'documents_with_content': len([d for d in self.documents if d.text_content]),
+            'documents_with_content': self._content_count,
             'total_unique_terms': len(self.frequencies),
             'top_terms_count': len(self.top_terms),
-            'elapsed_time_minutes': elapsed_time.total_seconds() / 60,
+            'elapsed_time_minutes': elapsed_minutes,
             'session_stats': self.session_stats
         }
 
@@ -619,7 +1304,12 @@ class Exporter:
     """
     Exportador de resultados a diferentes formatos
     """
-    
+
+    # Buffers derivados de 'frequencies' (arrays de numpy): no se
+    # exportan — serializarían como repr con elisión y son
+    # reconstruibles a partir del dict de frecuencias
+    _DERIVED_KEYS = frozenset({'freq_values', 'freq_sorted'})
+
     @staticmethod
     def export_to_csv(top_terms: List[tuple], filename: str):
         """Exportar términos principales a CSV"""
@@ -627,28 +1317,65 @@ class Exporter:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(['Término', 'Frecuencia'])
-            
-            for term, freq in top_terms:
-                writer.writerow([term, freq])
-                
+            # Entregar todas las filas de una vez al loop en C del
+            # módulo csv, sin un writerow de Python por término
+            writer.writerows(top_terms)
+
+
         logger.info(f"Resultados exportados a: {filename}")
         
+    @staticmethod
+    def _serialize_document(doc) -> Dict:
+        """Armar el dict exportable de un documento (con vista previa)"""
+        doc_data = doc.get_metadata()
+        text = doc.get_text()
+        doc_data['content_preview'] = text[:500] + '...' if len(text) > 500 else text
+        return doc_data
+
     @staticmethod
     def export_to_json(data: Dict, filename: str):
-        """Exportar datos completos a JSON"""
-        
-        # Serializar documentos
-        if 'documents' in data:
-            serialized_docs = []
-            for doc in data['documents']:
-                doc_data = doc.get_metadata()
-                doc_data['content_preview'] = doc.get_text()[:500] + '...' if len(doc.get_text()) > 500 else doc.get_text()
-                serialized_docs.append(doc_data)
-            data['documents'] = serialized_docs
-            
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=2, ensure_ascii=False, default=str)
-            
+        """
+        Exportar datos completos a JSON
+
+        Los documentos se serializan y escriben de a uno, en streaming:
+        el export no materializa la lista completa de dicts en memoria.
+        """
+        if orjson is not None:
+            def dumps(obj):
+                # OPT_NON_STR_KEYS: docs_per_year lleva claves int (el
+                # default sólo aplica a valores y orjson las rechaza)
+                return orjson.dumps(obj, default=str,
+                                    option=orjson.OPT_NON_STR_KEYS)
+        else:
+            def dumps(obj):
+                return json.dumps(obj, ensure_ascii=False,
+                                  default=str).encode('utf-8')
+
+        with open(filename, 'wb') as jsonfile:
+            write = jsonfile.write
+            write(b'{')
+            first = True
+
+            for key, value in data.items():
+                if key in Exporter._DERIVED_KEYS:
+                    continue
+                if not first:
+                    write(b',')
+                first = False
+
+                write(dumps(key) + b':')
+                if key == 'documents':
+                    write(b'[')
+                    for i, doc in enumerate(value):
+                        if i:
+                            write(b',')
+                        write(dumps(Exporter._serialize_document(doc)))
+                    write(b']')
+                else:
+                    write(dumps(value))
+
+            write(b'}')
+
         logger.info(f"Datos completos exportados a: {filename}")
 
 
@@ -656,35 +1383,44 @@ class Visualizer:
     """
     Generador de visualizaciones básicas
     """
-    
+
+    # Separador precalculado: no reconstruir '='*50 en cada llamada
+    _BAR = '=' * 50
+
     @staticmethod
     def print_top_terms(top_terms: List[tuple], top_n: int = 20):
         """Imprimir términos principales en consola"""
-        
-        print(f"\n{'='*50}")
-        print(f"TOP {top_n} TÉRMINOS MÁS FRECUENTES")
-        print(f"{'='*50}")
-        
-        for i, (term, freq) in enumerate(top_terms[:top_n], 1):
-            print(f"{i:2d}. {term:<20} {freq:>6} ocurrencias")
-            
+
+        lines = ['', Visualizer._BAR,
+                 f"TOP {top_n} TÉRMINOS MÁS FRECUENTES",
+                 Visualizer._BAR]
+        lines.extend(f"{i:2d}. {term:<20} {freq:>6} ocurrencias"
+                     for i, (term, freq) in enumerate(top_terms[:top_n], 1))
+
+        # Una sola escritura a stdout en lugar de un print por línea
+        sys.stdout.write('\n'.join(lines) + '\n')
+
     @staticmethod
     def print_summary(summary: Dict):
         """Imprimir resumen de la sesión"""
-        
-        print(f"\n{'='*50}")
-        print(f"RESUMEN DE LA SESIÓN")
-        print(f"{'='*50}")
-        
-        print(f"Documentos totales: {summary['total_documents']}")
-        print(f"Documentos con contenido: {summary['documents_with_content']}")
-        print(f"Términos únicos encontrados: {summary['total_unique_terms']}")
-        print(f"Tiempo transcurrido: {summary['elapsed_time_minutes']:.1f} minutos")
-        
+
+        lines = [
+            '', Visualizer._BAR,
+            "RESUMEN DE LA SESIÓN",
+            Visualizer._BAR,
+            f"Documentos totales: {summary['total_documents']}",
+            f"Documentos con contenido: {summary['documents_with_content']}",
+            f"Términos únicos encontrados: {summary['total_unique_terms']}",
+            f"Tiempo transcurrido: {summary['elapsed_time_minutes']:.1f} minutos",
+        ]
+
         if 'session_stats' in summary:
             stats = summary['session_stats']
             if 'success_rate' in stats:
-                print(f"Tasa de éxito de requests: {stats['success_rate']:.1f}%")
+                lines.append(
+                    f"Tasa de éxito de requests: {stats['success_rate']:.1f}%")
+
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 class HistoricalTermAnalyzer:
@@ -692,14 +1428,21 @@ class HistoricalTermAnalyzer:
     Orquestador principal del sistema de análisis histórico de términos
     """
     
-    def __init__(self, rate_limit_delay: float = 4.0):
+    def __init__(self, rate_limit_delay: float = 4.0,
+                 max_workers: int = 8,
+                 burst: int = 1):
         """
         Inicializar analizador histórico
-        
+
         Args:
             rate_limit_delay: Delay entre requests a Internet Archive
+            max_workers: Threads en paralelo para las descargas (el
+                token bucket del cliente sigue acotando el ritmo global)
+            burst: Requests que pueden salir de corrido antes de que el
+                rate limiting empiece a espaciar
         """
-        self.client = InternetArchiveClient(rate_limit_delay)
+        self.client = InternetArchiveClient(rate_limit_delay, burst=burst)
+        self.max_workers = max_workers
         self.processor = TextProcessor()
         self.memory = SessionMemory()
         self.exporter = Exporter()
@@ -725,9 +1468,43 @@ class HistoricalTermAnalyzer:
             Diccionario con resultados del análisis
         """
         
+        results: Dict = {'error': 'No se encontraron documentos'}
+        for _done, _total, partial in self.analyze_period_iter(
+                start_year, end_year, max_documents=max_documents,
+                language=language, search_terms=search_terms):
+            if partial is not None:
+                results = partial
+        return results
+
+    def analyze_period_iter(self,
+                            start_year: int,
+                            end_year: int,
+                            max_documents: int = 600,
+                            language: str = 'eng',
+                            search_terms: Optional[List[str]] = None):
+        """
+        Versión incremental de analyze_period
+
+        Genera tuplas (completados, total, resultados) a medida que
+        avanzan las descargas, con resultados en None hasta la última;
+        permite a una interfaz (por ejemplo la barra de progreso de
+        Streamlit) reflejar el avance real en vez de saltar de 0 a 100.
+
+        Args:
+            start_year: Año de inicio del período
+            end_year: Año de fin del período
+            max_documents: Número máximo de documentos a analizar
+            language: Idioma de los documentos ('eng' para inglés)
+            search_terms: Términos específicos a buscar (opcional)
+
+        Yields:
+            Tuplas (completados, total, resultados parciales o None);
+            la última tupla lleva el diccionario de resultados completo
+        """
+
         logger.info(f"Iniciando análisis histórico: {start_year}-{end_year}")
         logger.info(f"Parámetros: max_docs={max_documents}, idioma={language}")
-        
+
         # Parámetros de búsqueda
         query_params = {
             'start_year': start_year,
@@ -735,82 +1512,225 @@ class HistoricalTermAnalyzer:
             'language': language,
             'terms': search_terms
         }
-        
+
         try:
             # Fase 1: Búsqueda de documentos
             logger.info("Fase 1: Búsqueda de documentos...")
             documents = self.client.search_items(query_params, max_documents)
-            
+
             if not documents:
                 logger.error("No se encontraron documentos")
-                return {'error': 'No se encontraron documentos'}
-                
+                yield (0, 0, {'error': 'No se encontraron documentos'})
+                return
+
             self.memory.add_documents(documents)
-            
+
             # Fase 2: Descarga de contenido
             logger.info("Fase 2: Descarga de contenido textual...")
-            self._download_document_content(documents)
-            
+            total = len(documents)
+            yield (0, total, None)
+            for done, total in self._download_progress(documents,
+                                                       memory=self.memory):
+                yield (done, total, None)
+
             # Fase 3: Análisis de frecuencias
             logger.info("Fase 3: Análisis de frecuencias...")
             frequencies = self.processor.calculate_frequencies(documents)
             self.memory.set_frequencies(frequencies)
-            
+
             # Fase 4: Obtener términos principales
             top_terms = self.processor.get_top_terms(frequencies, top_n=100)
             self.memory.set_top_terms(top_terms)
-            
+
             # Actualizar estadísticas
             client_stats = self.client.get_stats()
             self.memory.update_stats(client_stats)
-            
+
+            # Las frecuencias ya están calculadas: soltar el texto
+            # completo y quedarse con las vistas previas
+            for doc in documents:
+                doc.release_text()
+
             # Generar resultados
             results = self._generate_results()
-            
+
             logger.info("Análisis completado exitosamente")
-            return results
-            
+            yield (total, total, results)
+
         except Exception as e:
             logger.error(f"Error en análisis: {e}")
-            return {'error': str(e)}
+            yield (0, 0, {'error': str(e)})
             
-    def _download_document_content(self, documents: List[Document]):
-        """Descargar contenido textual para todos los documentos"""
-        
+    def fetch_range(self,
+                    start_year: int,
+                    end_year: int,
+                    max_documents: int = 600,
+                    language: str = 'eng',
+                    search_terms: Optional[List[str]] = None) -> List[Document]:
+        """
+        Buscar y descargar documentos de un rango de años sin analizarlos
+
+        Permite traer un rango amplio una sola vez y luego particionarlo
+        localmente (por ejemplo por períodos) con analyze_documents,
+        evitando repetir búsquedas y descargas sobre rangos solapados.
+
+        Args:
+            start_year: Año de inicio del rango
+            end_year: Año de fin del rango
+            max_documents: Número máximo de documentos
+            language: Idioma de los documentos
+            search_terms: Términos específicos a buscar (opcional)
+
+        Returns:
+            Lista de documentos con su contenido textual descargado
+        """
+        query_params = {
+            'start_year': start_year,
+            'end_year': end_year,
+            'language': language,
+            'terms': search_terms
+        }
+
+        logger.info(f"Descargando rango {start_year}-{end_year}...")
+        documents = self.client.search_items(query_params, max_documents)
+
+        if documents:
+            self._download_document_content(documents)
+
+        return documents
+
+    def analyze_documents(self, documents: List[Document]) -> Dict:
+        """
+        Analizar frecuencias sobre documentos ya descargados
+
+        Args:
+            documents: Documentos con contenido (ver fetch_range)
+
+        Returns:
+            Diccionario con resultados del análisis; usa una memoria de
+            sesión nueva para no mezclar con análisis anteriores
+        """
+        if not documents:
+            return {'error': 'No se encontraron documentos'}
+
+        self.memory = SessionMemory()
+        self.memory.add_documents(documents)
+
+        frequencies = self.processor.calculate_frequencies(documents)
+        self.memory.set_frequencies(frequencies)
+
+        top_terms = self.processor.get_top_terms(frequencies, top_n=100)
+        self.memory.set_top_terms(top_terms)
+
+        self.memory.update_stats(self.client.get_stats())
+
+        return self._generate_results()
+
+    def _download_document_content(self, documents: List[Document],
+                                   memory: Optional[SessionMemory] = None):
+        """
+        Descargar contenido textual para todos los documentos
+
+        Args:
+            documents: Documentos a descargar
+            memory: Memoria de sesión a notificar por cada documento
+                que recibe contenido (si los documentos ya están en ella)
+        """
+        for _done, _total in self._download_progress(documents, memory):
+            pass
+
+    def _download_progress(self, documents: List[Document],
+                           memory: Optional[SessionMemory] = None):
+        """
+        Descargar contenido generando (completados, total) por documento
+
+        Las descargas corren en paralelo con threads: el tiempo de pared
+        está dominado por la latencia HTTP, y el token bucket del
+        cliente sigue acotando el ritmo global de requests aunque haya
+        varios workers en vuelo.
+
+        Args:
+            documents: Documentos a descargar
+            memory: Memoria de sesión a notificar por cada documento
+                que recibe contenido (si los documentos ya están en ella)
+
+        Yields:
+            Tuplas (completados, total) a medida que terminan descargas
+        """
+
+        # Búsquedas con rangos o términos solapados repiten identifiers:
+        # descargar cada uno una sola vez
+        seen = set()
+        unique_docs = [doc for doc in documents
+                       if doc.identifier not in seen
+                       and not seen.add(doc.identifier)]
+        if len(unique_docs) < len(documents):
+            logger.info(f"Omitiendo {len(documents) - len(unique_docs)} "
+                        f"documentos duplicados")
+
         successful_downloads = 0
-        total_docs = len(documents)
-        
-        for i, doc in enumerate(documents, 1):
-            try:
-                logger.info(f"Descargando {i}/{total_docs}: {doc.identifier}")
-                
-                content = self.client.download_text(doc.identifier)
-                if content:
-                    doc.set_content(content)
-                    successful_downloads += 1
-                    logger.debug(f"Contenido descargado: {len(content)} caracteres")
-                else:
-                    logger.warning(f"No se pudo obtener contenido para {doc.identifier}")
-                    
-                # Rate limiting
-                if i % 10 == 0:
-                    logger.info(f"Progreso: {i}/{total_docs} documentos procesados")
-                    
-            except Exception as e:
-                logger.error(f"Error descargando {doc.identifier}: {e}")
-                continue
-                
+        total_docs = len(unique_docs)
+
+        with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, max(total_docs, 1))) as executor:
+            futures = {
+                executor.submit(self.client.download_text, doc.identifier): doc
+                for doc in unique_docs
+            }
+
+            for i, future in enumerate(as_completed(futures), 1):
+                doc = futures[future]
+                try:
+                    content = future.result()
+                    if content:
+                        doc.set_content(content)
+                        if memory is not None:
+                            memory.mark_content()
+                        successful_downloads += 1
+                        # El guard evita formatear el f-string por
+                        # documento cuando DEBUG está apagado
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Contenido descargado: {len(content)} caracteres")
+                    else:
+                        logger.warning(f"No se pudo obtener contenido para {doc.identifier}")
+
+                    if i % 10 == 0:
+                        logger.info(f"Progreso: {i}/{total_docs} documentos procesados")
+
+                except Exception as e:
+                    logger.error(f"Error descargando {doc.identifier}: {e}")
+
+                yield (i, total_docs)
+
         logger.info(f"Descarga completada: {successful_downloads}/{total_docs} exitosos")
         
     def _generate_results(self) -> Dict:
         """Generar diccionario de resultados completos"""
-        
+
         summary = self.memory.get_summary()
-        
+
+        # Vista columnar de las frecuencias: los consumidores (stats,
+        # histogramas, cortes top-N) comparten un único buffer contiguo
+        # en vez de rearmar listas desde el dict en cada uso
+        if np is not None:
+            freq_values = np.fromiter(self.memory.frequencies.values(),
+                                      dtype=np.int32,
+                                      count=len(self.memory.frequencies))
+            freq_sorted = np.sort(freq_values)[::-1]
+        else:
+            freq_values = sorted(self.memory.frequencies.values())
+            freq_sorted = freq_values[::-1]
+
         return {
             'summary': summary,
             'documents': self.memory.documents,
             'frequencies': self.memory.frequencies,
+            'freq_values': freq_values,
+            'freq_sorted': freq_sorted,
+            # Histograma por año precalculado: los consumidores lo leen
+            # directo en vez de recorrer los documentos en cada render
+            'docs_per_year': dict(Counter(
+                doc.year for doc in self.memory.documents if doc.year)),
             'top_terms': self.memory.top_terms,
             'analysis_metadata': {
                 'analyzer_version': '1.0',
@@ -830,14 +1750,18 @@ class HistoricalTermAnalyzer:
         """
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
+
+        # Resolver el directorio una sola vez (y crearlo si no existe)
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+
         # Exportar términos principales a CSV
-        csv_filename = f"{output_dir}/top_terms_{timestamp}.csv"
-        self.exporter.export_to_csv(results['top_terms'], csv_filename)
-        
+        self.exporter.export_to_csv(results['top_terms'],
+                                    str(out / f"top_terms_{timestamp}.csv"))
+
         # Exportar datos completos a JSON
-        json_filename = f"{output_dir}/analysis_results_{timestamp}.json"
-        self.exporter.export_to_json(results, json_filename)
+        self.exporter.export_to_json(
+            results, str(out / f"analysis_results_{timestamp}.json"))
         
     def display_results(self, results: Dict, top_n: int = 20):
         """
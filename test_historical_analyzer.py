@@ -4,23 +4,51 @@ Valida filtros, límites y funcionalidad básica del sistema
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from collections import Counter
+from unittest.mock import patch
 import json
+import tempfile
 from datetime import datetime
 import sys
 import os
 
+import requests_mock
+
 # Agregar el directorio padre al path para importar el módulo
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from historical_term_analyzer import (
-    Document, 
-    InternetArchiveClient, 
-    TextProcessor, 
+    Document,
+    Exporter,
+    InternetArchiveClient,
+    TextProcessor,
     SessionMemory,
     HistoricalTermAnalyzer
 )
 
+# Fecha fija compartida: evita llamadas a datetime.now() en los loops
+# de fixtures y hace los documentos de prueba deterministas
+FIXED_DT = datetime(2000, 1, 1)
+
+# Lote de documentos reutilizable para los tests que no los mutan
+SAMPLE_DOCS = [
+    Document(f"test-{i}", f"Test {i}", FIXED_DT, 2000)
+    for i in range(10)
+]
+
+# Los tests no necesitan throttle real: anular time.sleep del módulo
+# elimina las esperas del token bucket durante toda la suite
+_sleep_patcher = patch('historical_term_analyzer.time.sleep',
+                       lambda *_args: None)
+
+
+def setUpModule():
+    _sleep_patcher.start()
+
+
+def tearDownModule():
+    _sleep_patcher.stop()
+
 
 class TestDocument(unittest.TestCase):
     """Test cases para la clase Document"""
@@ -57,23 +85,30 @@ class TestDocument(unittest.TestCase):
 
 class TestTextProcessor(unittest.TestCase):
     """Test cases para la clase TextProcessor"""
-    
-    def setUp(self):
-        self.processor = TextProcessor()
-        
+
+    @classmethod
+    def setUpClass(cls):
+        # El procesador no guarda estado entre tests (el caché de
+        # contadores es transparente): alcanza con una instancia
+        cls.processor = TextProcessor()
+
     def test_extract_terms_basic(self):
         """Probar extracción básica de términos"""
         text = "The quick brown fox jumps over the lazy dog."
         terms = self.processor.extract_terms(text)
-        
+
+        # Membresía contra un set: O(1) por chequeo en vez de
+        # escanear la lista completa en cada assert
+        term_set = set(terms)
+
         # Verificar que se excluyen stop words
-        self.assertNotIn('the', terms)
-        self.assertNotIn('over', terms)
-        
+        self.assertNotIn('the', term_set)
+        self.assertNotIn('over', term_set)
+
         # Verificar que se incluyen palabras relevantes
-        self.assertIn('quick', terms)
-        self.assertIn('brown', terms)
-        self.assertIn('jumps', terms)
+        self.assertIn('quick', term_set)
+        self.assertIn('brown', term_set)
+        self.assertIn('jumps', term_set)
         
     def test_extract_terms_empty(self):
         """Probar con texto vacío"""
@@ -85,17 +120,18 @@ class TestTextProcessor(unittest.TestCase):
         text = "COMPUTER computer Computer"
         terms = self.processor.extract_terms(text)
         
-        # Todos deberían convertirse a minúsculas
-        expected_terms = ['computer', 'computer', 'computer']
-        self.assertEqual(terms, expected_terms)
+        # Todos deberían convertirse a minúsculas; con elementos
+        # idénticos la igualdad de multiconjuntos equivale a la de
+        # listas y compara como dicts en C
+        self.assertEqual(Counter(terms), Counter(['computer'] * 3))
         
     def test_calculate_frequencies(self):
         """Probar cálculo de frecuencias"""
         # Crear documentos de prueba
-        doc1 = Document("test1", "Test 1", datetime.now(), 2000)
+        doc1 = Document("test1", "Test 1", FIXED_DT, 2000)
         doc1.set_content("computer science technology")
         
-        doc2 = Document("test2", "Test 2", datetime.now(), 2001)
+        doc2 = Document("test2", "Test 2", datetime(2001, 1, 1), 2001)
         doc2.set_content("computer programming technology software")
         
         documents = [doc1, doc2]
@@ -128,32 +164,44 @@ class TestTextProcessor(unittest.TestCase):
 
 class TestInternetArchiveClient(unittest.TestCase):
     """Test cases para la clase InternetArchiveClient"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # Un solo cliente por clase: armar la sesión HTTP con sus
+        # adapters en cada test repite trabajo que ningún test necesita
+        cls.client = InternetArchiveClient(rate_limit_delay=0.1)  # Delay corto para tests
+
     def setUp(self):
-        self.client = InternetArchiveClient(rate_limit_delay=0.1)  # Delay corto para tests
-        
+        # Los tests de _make_request mutan los contadores: resetearlos
+        # es más barato que reconstruir el cliente entero
+        self.client.total_requests = 0
+        self.client.failed_requests = 0
+        self.client.cache_hits = 0
+
     def test_client_initialization(self):
         """Probar inicialización del cliente"""
         self.assertEqual(self.client.rate_limit_delay, 0.1)
         self.assertEqual(self.client.total_requests, 0)
         self.assertEqual(self.client.failed_requests, 0)
         
-    def test_validate_english_content(self):
-        """Probar validación de contenido en inglés"""
-        
-        # Texto en inglés
+    # Un caso por método: permite correr/seleccionar cada escenario por
+    # separado y repartirlos entre workers de pytest-xdist
+    def test_validate_english_content_english(self):
+        """Probar validación con texto en inglés"""
         english_text = """
-        The Internet Archive is a digital library with the stated mission of 
-        providing universal access to all knowledge. It provides permanent storage 
+        The Internet Archive is a digital library with the stated mission of
+        providing universal access to all knowledge. It provides permanent storage
         for millions of free books, movies, music, television programs and more.
         """
         self.assertTrue(self.client.validate_english_content(english_text))
-        
-        # Texto muy corto
+
+    def test_validate_english_content_short(self):
+        """Probar validación con texto muy corto"""
         short_text = "Hi there"
         self.assertFalse(self.client.validate_english_content(short_text))
-        
-        # Texto con muchos caracteres no latinos
+
+    def test_validate_english_content_non_latin(self):
+        """Probar validación con caracteres no latinos"""
         non_latin_text = "这是中文文本，不应该被识别为英文"
         self.assertFalse(self.client.validate_english_content(non_latin_text))
         
@@ -181,51 +229,48 @@ class TestInternetArchiveClient(unittest.TestCase):
         # Verificar que se mantiene contenido válido
         self.assertIn('paragraph with content', clean_content)
         
-    @patch('requests.Session.get')
-    def test_make_request_success(self, mock_get):
+    def test_make_request_success(self):
         """Probar request exitoso"""
-        # Mock de respuesta exitosa
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'test': 'data'}
-        mock_get.return_value = mock_response
-        
-        response = self.client._make_request('http://test.com')
-        
+        # requests_mock intercepta a nivel adapter: respuestas reales
+        # de requests en vez de un Mock con atributos simulados
+        with requests_mock.Mocker(session=self.client.session) as mocker:
+            mocker.get('http://test.com', json={'test': 'data'},
+                       status_code=200)
+            response = self.client._make_request('http://test.com')
+
         self.assertIsNotNone(response)
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'test': 'data'})
         self.assertEqual(self.client.total_requests, 1)
-        
-    @patch('requests.Session.get')
-    def test_make_request_404(self, mock_get):
+
+    def test_make_request_404(self):
         """Probar request con error 404"""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
-        
-        response = self.client._make_request('http://test.com')
-        
+        with requests_mock.Mocker(session=self.client.session) as mocker:
+            mocker.get('http://test.com', status_code=404)
+            response = self.client._make_request('http://test.com')
+
         self.assertIsNone(response)
         self.assertEqual(self.client.total_requests, 1)
         
-    def test_document_validation(self):
-        """Probar validación de documentos"""
-        query_params = {
-            'start_year': 1995,
-            'end_year': 2005
-        }
-        
-        # Documento válido
+    QUERY_PARAMS = {
+        'start_year': 1995,
+        'end_year': 2005
+    }
+
+    def test_document_validation_valid(self):
+        """Probar validación con documento válido"""
         valid_doc = Document("valid-test-123", "Valid Document", datetime(2000, 1, 1), 2000)
-        self.assertTrue(self.client._validate_document(valid_doc, query_params))
-        
-        # Documento fuera de rango de años
+        self.assertTrue(self.client._validate_document(valid_doc, self.QUERY_PARAMS))
+
+    def test_document_validation_year_out_of_range(self):
+        """Probar validación con documento fuera de rango de años"""
         invalid_doc = Document("invalid-test-123", "Invalid Document", datetime(2010, 1, 1), 2010)
-        self.assertFalse(self.client._validate_document(invalid_doc, query_params))
-        
-        # Documento con identificador inválido
+        self.assertFalse(self.client._validate_document(invalid_doc, self.QUERY_PARAMS))
+
+    def test_document_validation_short_identifier(self):
+        """Probar validación con identificador inválido"""
         invalid_id_doc = Document("abc", "Short ID", datetime(2000, 1, 1), 2000)
-        self.assertFalse(self.client._validate_document(invalid_id_doc, query_params))
+        self.assertFalse(self.client._validate_document(invalid_id_doc, self.QUERY_PARAMS))
 
 
 class TestSessionMemory(unittest.TestCase):
@@ -243,8 +288,8 @@ class TestSessionMemory(unittest.TestCase):
         
     def test_add_documents(self):
         """Probar agregado de documentos"""
-        doc1 = Document("test1", "Test 1", datetime.now(), 2000)
-        doc2 = Document("test2", "Test 2", datetime.now(), 2001)
+        doc1 = Document("test1", "Test 1", FIXED_DT, 2000)
+        doc2 = Document("test2", "Test 2", datetime(2001, 1, 1), 2001)
         
         self.memory.add_documents([doc1, doc2])
         
@@ -262,7 +307,7 @@ class TestSessionMemory(unittest.TestCase):
     def test_get_summary(self):
         """Probar generación de resumen"""
         # Agregar datos de prueba
-        doc = Document("test", "Test", datetime.now(), 2000)
+        doc = Document("test", "Test", FIXED_DT, 2000)
         doc.set_content("test content")
         self.memory.add_documents([doc])
         
@@ -278,28 +323,100 @@ class TestSessionMemory(unittest.TestCase):
         self.assertIn('elapsed_time_minutes', summary)
 
 
+class TestExporter(unittest.TestCase):
+    """Test cases para la clase Exporter"""
+
+    def test_export_to_json_round_trip(self):
+        """Probar que el JSON exportado se puede volver a cargar"""
+        doc = Document("test-export-1", "Export Test", FIXED_DT, 2000)
+        doc.set_content("computer science content for the export test")
+
+        data = {
+            'summary': {'total_documents': 1},
+            'documents': [doc],
+            'frequencies': {'computer': 2, 'science': 1},
+            # Claves int, como las genera _generate_results
+            'docs_per_year': {2000: 1},
+            # Buffers derivados (arrays en los resultados reales):
+            # no deben aparecer en el export
+            'freq_values': [2, 1],
+            'freq_sorted': [2, 1],
+            'top_terms': [('computer', 2)],
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.json')
+            Exporter.export_to_json(data, path)
+            with open(path, encoding='utf-8') as jsonfile:
+                loaded = json.load(jsonfile)
+
+        # Las claves numéricas deben serializarse como strings JSON
+        self.assertEqual(loaded['docs_per_year'], {'2000': 1})
+        self.assertEqual(loaded['frequencies'],
+                         {'computer': 2, 'science': 1})
+        self.assertEqual(loaded['top_terms'], [['computer', 2]])
+        self.assertEqual(loaded['documents'][0]['identifier'],
+                         'test-export-1')
+
+        # Los buffers derivados quedan fuera del export
+        self.assertNotIn('freq_values', loaded)
+        self.assertNotIn('freq_sorted', loaded)
+
+
+class _FakeArchiveClient:
+    """
+    Doble liviano del cliente de Internet Archive
+
+    Evita el bookkeeping por llamada de MagicMock (registro de calls,
+    resolución de atributos) en el flujo completo; el contenido se
+    sirve por identifier, lo que además es seguro con las descargas
+    en threads.
+    """
+
+    def __init__(self, documents, texts_by_identifier):
+        self._documents = documents
+        self._texts = texts_by_identifier
+
+    def search_items(self, query_params, max_results=600):
+        return self._documents
+
+    def download_text(self, identifier):
+        return self._texts[identifier]
+
+    def get_stats(self):
+        return {
+            'total_requests': len(self._texts),
+            'failed_requests': 0,
+            'cache_hits': 0,
+            'success_rate': 100.0
+        }
+
+
 class TestIntegration(unittest.TestCase):
     """Test de integración para el sistema completo"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = HistoricalTermAnalyzer(rate_limit_delay=0.1)
+
     def setUp(self):
-        self.analyzer = HistoricalTermAnalyzer(rate_limit_delay=0.1)
-        
-    @patch('historical_term_analyzer.InternetArchiveClient.search_items')
-    @patch('historical_term_analyzer.InternetArchiveClient.download_text')
-    def test_full_analysis_workflow(self, mock_download, mock_search):
+        # Memoria fresca por test: el analizador compartido acumula
+        # documentos y frecuencias entre corridas
+        self.analyzer.memory = SessionMemory()
+
+    def test_full_analysis_workflow(self):
         """Probar el flujo completo de análisis"""
-        
-        # Mock de documentos encontrados
+
+        # Documentos encontrados y contenido descargado simulados
         doc1 = Document("test1", "Computer Science", datetime(1999, 1, 1), 1999)
         doc2 = Document("test2", "Technology Today", datetime(2001, 1, 1), 2001)
-        mock_search.return_value = [doc1, doc2]
-        
-        # Mock de contenido descargado
-        mock_download.side_effect = [
-            "Computer science is the study of algorithmic processes and computational systems.",
-            "Technology has advanced rapidly in recent years with new innovations."
-        ]
-        
+        real_client = self.analyzer.client
+        self.analyzer.client = _FakeArchiveClient([doc1, doc2], {
+            "test1": "Computer science is the study of algorithmic processes and computational systems.",
+            "test2": "Technology has advanced rapidly in recent years with new innovations."
+        })
+        self.addCleanup(setattr, self.analyzer, 'client', real_client)
+
         # Ejecutar análisis
         results = self.analyzer.analyze_period(
             start_year=1995,
@@ -326,10 +443,11 @@ class TestIntegration(unittest.TestCase):
 
 class TestValidationAndLimits(unittest.TestCase):
     """Tests específicos para validaciones y límites del sistema"""
-    
-    def setUp(self):
-        self.client = InternetArchiveClient()
-        
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = InternetArchiveClient()
+
     def test_rate_limiting_parameters(self):
         """Probar parámetros de rate limiting"""
         # Valor por defecto
@@ -346,10 +464,7 @@ class TestValidationAndLimits(unittest.TestCase):
         
         # Simular búsqueda con límites
         with patch.object(self.client, '_search_page') as mock_search_page:
-            mock_search_page.return_value = [
-                Document(f"test-{i}", f"Test {i}", datetime(2000, 1, 1), 2000)
-                for i in range(10)
-            ]
+            mock_search_page.return_value = SAMPLE_DOCS
             
             # Buscar con límite de 25 documentos
             results = self.client.search_items(query_params, max_results=25)
@@ -357,26 +472,26 @@ class TestValidationAndLimits(unittest.TestCase):
             # Verificar que respeta el límite
             self.assertLessEqual(len(results), 25)
             
-    def test_english_validation_edge_cases(self):
-        """Probar validación de inglés con casos límite"""
-        
-        # Texto mixto (inglés con algunas palabras en otros idiomas)
+    def test_english_validation_mixed_text(self):
+        """Probar validación con texto mixto (inglés y otros idiomas)"""
         mixed_text = """
         This is mostly English text with some français words mixed in.
         The document discusses computer science and technology topics.
         There are occasional deutsche Wörter but the main language is English.
         """
         self.assertTrue(self.client.validate_english_content(mixed_text))
-        
-        # Texto técnico con términos especializados
+
+    def test_english_validation_technical_text(self):
+        """Probar validación con texto técnico especializado"""
         technical_text = """
         The algorithm implements a binary search tree with O(log n) complexity.
         Database normalization follows the principles of ACID transactions.
         Machine learning models utilize gradient descent optimization techniques.
         """
         self.assertTrue(self.client.validate_english_content(technical_text))
-        
-        # Texto con muchos números y símbolos
+
+    def test_english_validation_numeric_text(self):
+        """Probar validación con texto dominado por números y símbolos"""
         numeric_text = """
         Data: 123, 456, 789
         Results: $50.25, €30.15, £25.99
@@ -387,9 +502,7 @@ class TestValidationAndLimits(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    # Configurar logging para tests
-    import logging
-    logging.basicConfig(level=logging.WARNING)
-    
-    # Ejecutar tests
-    unittest.main(verbosity=2)
\ No newline at end of file
+    # Correr vía pytest para aprovechar xdist (-n auto reparte las
+    # clases entre cores); el logging lo configura conftest.py
+    import pytest
+    sys.exit(pytest.main([__file__, '-v']))
\ No newline at end of file